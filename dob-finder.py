@@ -8,11 +8,15 @@ from datetime import datetime, timedelta
 from tqdm.auto import tqdm
 import pandas as pd
 import re
+import argparse
+import profiling
 
 # Constants
 OUTPUT_DIR = os.path.join("Information", "Saved DOBs")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
+profiler = profiling.Profiler("dob-finder")
+
 def extract_form_data(html):
     viewstate = re.search(r'id="__VIEWSTATE" value="([^"]+)"', html)
     eventvalidation = re.search(r'id="__EVENTVALIDATION" value="([^"]+)"', html)
@@ -88,7 +92,8 @@ async def fetch_for_roll(session, roll_no, semester, priority_groups, month_filt
         dates = generate_dates_interleaved(years, month_filter)
         with tqdm(total=len(dates), desc=f"DOBs for {roll_str}", leave=False, position=1, dynamic_ncols=True) as date_pbar:
             for dob in dates:
-                result = await try_dob(session, roll_str, semester, dob, semaphore)
+                with profiler.stage("dob lookup"):
+                    result = await try_dob(session, roll_str, semester, dob, semaphore)
                 if result == "DOWN":
                     return "DOWN"
                 
@@ -97,7 +102,8 @@ async def fetch_for_roll(session, roll_no, semester, priority_groups, month_filt
                     async with results_lock:
                         results.append({'Roll Number': roll_no, 'Semester': semester, 'Date of Birth': result})
                         try:
-                            pd.DataFrame(results).to_excel(filename, index=False)
+                            with profiler.stage("save"):
+                                pd.DataFrame(results).to_excel(filename, index=False)
                         except PermissionError:
                             pass # Will be saved later
                     roll_pbar.update(1)
@@ -106,7 +112,8 @@ async def fetch_for_roll(session, roll_no, semester, priority_groups, month_filt
     async with results_lock:
         results.append({'Roll Number': roll_no, 'Semester': semester, 'Date of Birth': "N.A."})
         try:
-            pd.DataFrame(results).to_excel(filename, index=False)
+            with profiler.stage("save"):
+                pd.DataFrame(results).to_excel(filename, index=False)
         except PermissionError:
             pass
     roll_pbar.update(1)
@@ -132,14 +139,16 @@ async def run_custom_roll_search(roll_numbers, semester, month_filter):
     connector = aiohttp.TCPConnector(limit=100)
     async with ClientSession(connector=connector) as session:
         print(f"🔍 Checking website status...")
-        is_up, status_msg = await check_website_status(session, url)
+        with profiler.stage("status check"):
+            is_up, status_msg = await check_website_status(session, url)
         if not is_up:
             print(f"🛑 Website is DOWN: {status_msg}")
             print("Please try again later.")
             return
 
         if os.path.exists(filename):
-            existing_df = pd.read_excel(filename)
+            with profiler.stage("input"):
+                existing_df = pd.read_excel(filename)
             completed_rolls = set(existing_df["Roll Number"].astype(int))
             print(f"🔁 Resuming... {len(completed_rolls)} already done.")
         else:
@@ -156,7 +165,8 @@ async def run_custom_roll_search(roll_numbers, semester, month_filter):
                 fetch_for_roll(session, rn, semester, priority_groups, month_filter, semaphore, results, results_lock, roll_pbar, filename)
                 for rn in remaining_rolls
             ]
-            task_results = await asyncio.gather(*tasks)
+            with profiler.stage("search"):
+                task_results = await asyncio.gather(*tasks)
             
             if "DOWN" in task_results:
                 print(f"\n🛑 The website went down during the search. Some results might be missing.")
@@ -166,7 +176,8 @@ async def run_custom_roll_search(roll_numbers, semester, month_filter):
         if not results:
             break
         try:
-            pd.DataFrame(results).to_excel(filename, index=False)
+            with profiler.stage("save"):
+                pd.DataFrame(results).to_excel(filename, index=False)
             break
         except PermissionError:
             print(f"\n⚠️ Please close {filename} to save final results. Retrying in 5 seconds...")
@@ -187,6 +198,14 @@ def run_custom_main():
         print(f"❌ Error: {e}")
 
 # 🚀 Launch
-run_custom_main()
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the Date of Birth of DDU students by trying every likely date on the result portal.")
+    profiling.add_argument(parser)
+    args = parser.parse_args()
+    try:
+        profiler.start(args.profile)
+    except ValueError as e:
+        parser.error(str(e))
+    run_custom_main()
 
 #2515075160
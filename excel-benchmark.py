@@ -0,0 +1,260 @@
+# Measures excel-maker.py stage by stage on generated result documents, and checks its workbooks against golden copies
+
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import zipfile
+import argparse
+import tempfile
+import itertools
+import tracemalloc
+import importlib.util
+from xml.sax.saxutils import escape
+
+import openpyxl
+
+STAGES = ["parse", "store", "rank", "sheets", "write"]
+MAX_REPORTED_DIFFERENCES = 20
+
+FIRST_NAMES = ["AADITYA", "ANJALI", "ARPIT", "DEEPIKA", "HARSH", "KAVYA", "MOHIT", "NEHA", "PRIYA", "RAHUL", "SAKSHI", "VIKAS"]
+LAST_NAMES = ["GUPTA", "MISHRA", "PANDEY", "SHUKLA", "SINGH", "SRIVASTAVA", "TRIPATHI", "YADAV"]
+CORE_SUBJECTS = ["MAT{}01", "MAT{}02", "PHY{}01", "CHE{}01", "AE{}01"]
+ELECTIVES = ["SE{}01", "CS{}01", "BOT{}01", "ZOO{}01"]
+
+CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>
+</Types>"""
+PACKAGE_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>
+</Relationships>"""
+
+def load_script(file_name):
+    # The scripts have dashes in their names, so they cannot be imported the usual way
+    module_name = file_name.replace("-", "_").replace(".py", "")
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+def docx_cell(text, span=1, v_merge=None):
+    properties = (f'<w:gridSpan w:val="{span}"/>' if span > 1 else "") + (f'<w:vMerge w:val="{v_merge}"/>' if v_merge == "restart" else "<w:vMerge/>" if v_merge else "")
+    runs = f'<w:r><w:t xml:space="preserve">{escape(text)}</w:t></w:r>' if text else ""
+    return f"<w:tc>{f'<w:tcPr>{properties}</w:tcPr>' if properties else ''}<w:p>{runs}</w:p></w:tc>"
+
+def docx_table(rows):
+    return "<w:tbl>" + "".join("<w:tr>" + "".join(row) + "</w:tr>" for row in rows) + "</w:tbl>"
+
+def student_tables(rng, roll_no, semester):
+    """The result page of one student, laid out like a converted portal page: a university banner table and the result
+    table, with merged name and paper name cells and a vertically merged remarks column."""
+    subjects = [code.format(semester) for code in CORE_SUBJECTS] + [rng.choice(ELECTIVES).format(semester)]
+    marks = ["AB" if rng.random() < 0.02 else str(max(0, min(100, round(rng.gauss(62, 15))))) for _ in subjects]
+    failed = [code for code, mark in zip(subjects, marks) if mark == "AB" or int(mark) < 33]
+    numeric = [int(mark) if mark != "AB" else 0 for mark in marks]
+    sgpa = round(sum(numeric) / len(numeric) / 10, 2)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+    banner = docx_table([[docx_cell("DEEN DAYAL UPADHYAYA GORAKHPUR UNIVERSITY", span=6)], [docx_cell(f"Semester {semester} Examination Result", span=6)]])
+    rows = [
+        [docx_cell("Name"), docx_cell(name, span=3), docx_cell("Roll No"), docx_cell(roll_no)],
+        [docx_cell("Father's Name"), docx_cell(f"{rng.choice(FIRST_NAMES)} {name.split()[1]}", span=3), docx_cell("Semester"), docx_cell(f"Semester {semester}")],
+        [docx_cell("Paper Code"), docx_cell("Paper Name", span=2), docx_cell("Max Marks"), docx_cell("Obt. Marks"), docx_cell("Remarks")],
+    ]
+    for i, (code, mark) in enumerate(zip(subjects, marks)):
+        rows.append([docx_cell(code), docx_cell(f"Paper {code}", span=2), docx_cell("100"), docx_cell(mark),
+                     docx_cell("Theory", v_merge="restart") if i == 0 else docx_cell("", v_merge="continue")])
+    rows.append([
+        docx_cell(f"Result : {'FAILED' if failed else 'PASSED'}", span=2),
+        docx_cell(f"(SGPA) : {sgpa}", span=2),
+        # First semester pages have no CGPA
+        docx_cell(f"(CGPA) : {round(min(10.0, max(0.0, sgpa + rng.uniform(-0.5, 0.5))), 2)}" if semester > 1 else ""),
+        docx_cell(f"Carry Over Paper : {','.join(failed)}{',' if failed else ''}"),
+    ])
+    return banner + "<w:p/>" + docx_table(rows) + '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+def write_cohort_docx(path, students, semester, seed=None):
+    """Writes a result document of students pages. The same seed always gives the same document."""
+    rng = random.Random(seed if seed is not None else students * 1000 + semester)
+    body = "".join(student_tables(rng, str(2300001 + i), semester) for i in range(students))
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{body}<w:sectPr/></w:body></w:document>"
+    )
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", CONTENT_TYPES)
+        archive.writestr("_rels/.rels", PACKAGE_RELS)
+        archive.writestr("word/document.xml", document)
+
+def run_stages(excel_maker, docx_file, workbook_file, db_file, tie_policy):
+    """Runs every stage of excel-maker.py once, through the same functions main() uses. Yields (stage, seconds)."""
+    start = time.perf_counter()
+    student_data_list, all_subject_codes = excel_maker.extract_from_docx(docx_file)
+    yield "parse", time.perf_counter() - start
+
+    start = time.perf_counter()
+    store = excel_maker.ResultStore(db_file)
+    try:
+        store.save_semester("benchmark", "docx", docx_file, "benchmark", student_data_list)
+        student_data_list, all_subject_codes = store.load_semester("benchmark")
+    finally:
+        store.close()
+    yield "store", time.perf_counter() - start
+
+    start = time.perf_counter()
+    sorted_subject_codes = sorted(all_subject_codes, key=excel_maker.subject_sort_key)
+    ranking = excel_maker.rank_students(student_data_list, sorted_subject_codes, tie_policy)
+    yield "rank", time.perf_counter() - start
+
+    start = time.perf_counter()
+    sheets = excel_maker.build_sheets("benchmark", student_data_list, sorted_subject_codes, ranking)
+    yield "sheets", time.perf_counter() - start
+
+    start = time.perf_counter()
+    excel_maker.write_workbook(sheets, workbook_file)
+    yield "write", time.perf_counter() - start
+
+def measure_memory(excel_maker, docx_file, workbook_file, db_file, tie_policy):
+    """Peak Python heap of every stage in a second run, traced allocations make that run too slow to time."""
+    peaks = {}
+    tracemalloc.start()
+    try:
+        stages = run_stages(excel_maker, docx_file, workbook_file, db_file, tie_policy)
+        while True:
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            try:
+                stage, _ = next(stages)
+            except StopIteration:
+                break
+            peaks[stage] = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+def cell_style(cell):
+    """The formatting the golden check compares: font name, size and bold, and the alignment."""
+    if cell is None:
+        return None
+    font, alignment = cell.font, cell.alignment
+    return (font.name, font.sz, bool(font.b), alignment.horizontal, alignment.vertical, bool(alignment.wrap_text))
+
+def column_widths(worksheet):
+    return {letter: dimension.width for letter, dimension in worksheet.column_dimensions.items()}
+
+def workbook_differences(expected_file, actual_file, limit=MAX_REPORTED_DIFFERENCES):
+    """Differences in the values, cell formatting and column widths of two workbooks, as "Sheet!A1 value: expected != actual"
+    lines (at most limit)."""
+    # Not read-only, read-only sheets do not load the column widths
+    expected = openpyxl.load_workbook(expected_file)
+    actual = openpyxl.load_workbook(actual_file)
+    differences = []
+    try:
+        if expected.sheetnames != actual.sheetnames:
+            differences.append(f"sheets: {expected.sheetnames} != {actual.sheetnames}")
+        for title in [name for name in expected.sheetnames if name in actual.sheetnames]:
+            expected_widths, actual_widths = column_widths(expected[title]), column_widths(actual[title])
+            for letter in sorted(set(expected_widths) | set(actual_widths), key=lambda letter: (len(letter), letter)):
+                if expected_widths.get(letter) != actual_widths.get(letter):
+                    differences.append(f"{title} column {letter} width: {expected_widths.get(letter)!r} != {actual_widths.get(letter)!r}")
+            rows = itertools.zip_longest(expected[title].iter_rows(), actual[title].iter_rows(), fillvalue=())
+            for row_number, (expected_row, actual_row) in enumerate(rows, 1):
+                for column, (expected_cell, actual_cell) in enumerate(itertools.zip_longest(expected_row, actual_row), 1):
+                    reference = f"{title}!{openpyxl.utils.get_column_letter(column)}{row_number}"
+                    expected_value = expected_cell.value if expected_cell is not None else None
+                    actual_value = actual_cell.value if actual_cell is not None else None
+                    if expected_value != actual_value:
+                        differences.append(f"{reference} value: {expected_value!r} != {actual_value!r}")
+                    elif cell_style(expected_cell) != cell_style(actual_cell):
+                        differences.append(f"{reference} style: {cell_style(expected_cell)} != {cell_style(actual_cell)}")
+                    if len(differences) >= limit:
+                        return differences[:limit]
+    finally:
+        expected.close()
+        actual.close()
+    return differences[:limit]
+
+def check_golden(golden_dir, name, workbook_file, update=False):
+    """Compares a workbook with its golden copy, or saves it as the golden copy. Returns the differences found, None when saved."""
+    golden_file = os.path.join(golden_dir, name)
+    if update or not os.path.exists(golden_file):
+        os.makedirs(golden_dir, exist_ok=True)
+        shutil.copyfile(workbook_file, golden_file)
+        print(f"📌 Saved {golden_file} as the golden copy\n")
+        return None
+    return workbook_differences(golden_file, workbook_file)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark excel-maker.py on generated result documents and compare its workbooks with golden copies.")
+    parser.add_argument("--students", default="100,1000,10000", help="Comma separated cohort sizes (default: 100,1000,10000)")
+    parser.add_argument("--semester", type=int, default=3, help="Semester of the generated results, 1 has no CGPA (default: 3)")
+    parser.add_argument("--tie-policy", default="competition", help="Tie policy passed to excel-maker.py (default: competition)")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the second, traced run that measures peak memory per stage")
+    parser.add_argument("--golden", metavar="DIR", help="Compare every workbook cell by cell with its golden copy in DIR (saved there on the first run)")
+    parser.add_argument("--update-golden", action="store_true", help="Replace the golden copies with this run's workbooks")
+    parser.add_argument("--keep", metavar="DIR", help="Keep the generated documents and workbooks in DIR")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    args = parser.parse_args()
+    if args.update_golden and not args.golden:
+        parser.error("--update-golden needs --golden DIR")
+
+    excel_maker = load_script("excel-maker.py")
+    work_dir = args.keep or tempfile.mkdtemp(prefix="excel-benchmark-")
+    os.makedirs(work_dir, exist_ok=True)
+
+    results = []
+    compared = 0
+    mismatched = []
+    header = f"{'students':>8} {'stage':<7} {'seconds':>8} {'peak MB':>8}"
+    print(header)
+    print("-" * len(header))
+    try:
+        for students in [int(s) for s in args.students.split(",") if s.strip()]:
+            name = f"Semester_{args.semester}_{students}"
+            docx_file = os.path.join(work_dir, f"{name}.docx")
+            workbook_file = os.path.join(work_dir, f"{name}_Results.xlsx")
+            db_file = os.path.join(work_dir, f"{name}.sqlite")
+            if not os.path.exists(docx_file):
+                write_cohort_docx(docx_file, students, args.semester)
+
+            timings = dict(run_stages(excel_maker, docx_file, workbook_file, db_file, args.tie_policy))
+            peaks = {} if args.no_memory else measure_memory(excel_maker, docx_file, workbook_file + ".traced.xlsx", db_file, args.tie_policy)
+            for stage in STAGES:
+                peak = f"{peaks[stage] / (1024 * 1024):.1f}" if stage in peaks else "n/a"
+                print(f"{students:>8} {stage:<7} {timings[stage]:>8.3f} {peak:>8}")
+            print(f"{students:>8} {'total':<7} {sum(timings.values()):>8.3f}\n")
+            row = {"students": students, "semester": args.semester, "docx_mb": round(os.path.getsize(docx_file) / (1024 * 1024), 2),
+                   "seconds": {stage: round(timings[stage], 3) for stage in STAGES},
+                   "peak_mb": {stage: round(peaks[stage] / (1024 * 1024), 1) for stage in peaks}}
+
+            if args.golden:
+                differences = check_golden(args.golden, f"{name}_Results.xlsx", workbook_file, args.update_golden)
+                if differences is not None:
+                    compared += 1
+                    row["golden_differences"] = len(differences)
+                if differences:
+                    mismatched.append(name)
+                    print(f"❌ {name} differs from its golden copy:")
+                    for difference in differences:
+                        print(f"   {difference}")
+                    print()
+            results.append(row)
+    finally:
+        if not args.keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    if compared:
+        print(f"❌ {len(mismatched)} workbook(s) differ from the golden copies" if mismatched else "✅ Every workbook matches its golden copy")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
+    sys.exit(1 if mismatched else 0)
@@ -1,238 +1,1039 @@
-import docx
-import re
-import openpyxl
-from openpyxl.styles import Font, Alignment
-from openpyxl.utils import get_column_letter
-import os
-
-docx_files = [
-    os.path.join("Information", "pdf2docx", "1.docx"),
-    os.path.join("Information", "pdf2docx", "2.docx"),
-    os.path.join("Information", "pdf2docx", "3.docx")
-]
-
-def get_next_distinct(cells_matrix, keyword):
-    for row in cells_matrix:
-        if keyword in row:
-            idx = row.index(keyword)
-            # Find the first cell after keyword that is not the keyword
-            for i in range(idx, len(row)):
-                if row[i] != keyword and row[i].strip():
-                    return row[i].strip()
-    return ""
-
-def extract_from_docx(docx_file):
-    doc = docx.Document(docx_file)
-    student_data_list = []
-    all_subject_codes = set()
-    
-    for table in doc.tables:
-        cells_matrix = []
-        for row in table.rows:
-            # Replaces newlines with spaces and truncates whitespaces
-            row_cells = [c.text.strip().replace('\n', ' ') for c in row.cells]
-            cells_matrix.append(row_cells)
-            
-        name = get_next_distinct(cells_matrix, "Name")
-        roll = get_next_distinct(cells_matrix, "Roll No")
-        
-        if not roll:
-            continue
-            
-        sgpa = ""
-        cgpa = ""
-        result = "FAILED"
-        carry = "-"
-        
-        for row in cells_matrix:
-            # Check unique cells in the row
-            for cell in set(row):
-                if "Result :" in cell:
-                    result = cell.split("Result :")[1].strip()
-                if "(SGPA) :" in cell:
-                    try:
-                        sgpa = float(cell.split("(SGPA) :")[1].strip())
-                    except:
-                        pass
-                if "(CGPA) :" in cell:
-                    try:
-                        cgpa = float(cell.split("(CGPA) :")[1].strip())
-                    except:
-                        pass
-                if "Carry Over Paper :" in cell:
-                    val = cell.split("Carry Over Paper :")[1].strip().rstrip(",")
-                    if val:
-                        carry = val
-                        
-        subjects = {}
-        obt_idx = None
-        for row_cells in cells_matrix:
-            if "Obt. Marks" in row_cells:
-                obt_idx = row_cells.index("Obt. Marks")
-                
-            if obt_idx is not None:
-                code = row_cells[0]
-                # If there's a valid subject code
-                if re.match(r"^[A-Z]{1,6}\d+[A-Za-z0-9\-\*]*$", code):
-                    if obt_idx < len(row_cells):
-                        marks = row_cells[obt_idx]
-                        if marks:
-                            subjects[code] = marks
-                            
-        all_subject_codes.update(subjects.keys())
-        
-        student_data_list.append({
-            "roll": roll,
-            "name": name,
-            "sgpa": sgpa,
-            "cgpa": cgpa,
-            "result": result,
-            "carry": carry,
-            "subjects": subjects
-        })
-        
-    return student_data_list, all_subject_codes
-
-def parse_mark(mark_str):
-    try:
-        return float(mark_str)
-    except:
-        return -1
-
-def main():
-    os.makedirs(os.path.join("Information", "docx2xlsx"), exist_ok=True)
-    
-    for docx_file in docx_files:
-        if not os.path.exists(docx_file):
-            print(f"File not found: {docx_file}")
-            continue
-            
-        print(f"Processing {docx_file}...")
-        student_data_list, all_subject_codes = extract_from_docx(docx_file)
-        
-        if not student_data_list:
-            print(f"No student data found in {docx_file}.")
-            continue
-            
-        wb = openpyxl.Workbook()
-        if wb.active:
-            wb.remove(wb.active)
-            
-        # 1. Overall Results Sheet
-        student_data_list.sort(key=lambda x: (x["sgpa"] if isinstance(x["sgpa"], (int, float)) else 0), reverse=True)
-        
-        base_order = ["MAT", "PHY", "CHE", "AE", "SE"]
-        def subject_sort_key(code):
-            for i, prefix in enumerate(base_order):
-                if code.startswith(prefix):
-                    return (i, code)
-            return (len(base_order), code)
-            
-        sorted_subject_codes = sorted(list(all_subject_codes), key=subject_sort_key)
-        
-        ws_overall = wb.create_sheet(title="Overall Results")
-        
-        is_sem_1 = "1.docx" in docx_file.lower()
-        
-        if is_sem_1:
-            headers = ["Rank", "Roll Number", "Student's Name", "SGPA", "Result"] + sorted_subject_codes + ["Carry Over Paper"]
-        else:
-            headers = ["Rank", "Roll Number", "Student's Name", "SGPA", "CGPA", "Result"] + sorted_subject_codes + ["Carry Over Paper"]
-            
-        ws_overall.append(headers)
-        
-        for rank, student in enumerate(student_data_list, 1):
-            if is_sem_1:
-                row_data = [
-                    rank,
-                    student["roll"],
-                    student["name"],
-                    student["sgpa"],
-                    student["result"]
-                ]
-            else:
-                row_data = [
-                    rank,
-                    student["roll"],
-                    student["name"],
-                    student["sgpa"],
-                    student["cgpa"],
-                    student["result"]
-                ]
-                
-            for code in sorted_subject_codes:
-                mark = student["subjects"].get(code, "")
-                row_data.append(mark)
-                
-            row_data.append(student["carry"])
-            ws_overall.append(row_data)
-        
-        # 2. Subject Ranks Sheets
-        subject_students_map = {}
-        for student in student_data_list:
-            for code, marks in student["subjects"].items():
-                if code not in subject_students_map:
-                    subject_students_map[code] = []
-                subject_students_map[code].append({
-                    "roll": student["roll"],
-                    "name": student["name"],
-                    "marks": marks
-                })
-        
-        sorted_subjects = sorted(list(subject_students_map.keys()), key=subject_sort_key)
-        
-        for code in sorted_subjects:
-            # Sanitize sheet name if it exceeds 31 chars or has invalid chars
-            safe_sheet_name = re.sub(r'[\\*?:/\[\]]', '_', code)[:31]
-            ws_subj = wb.create_sheet(title=safe_sheet_name)
-            
-            headers = ["Subject Rank", "Roll Number", "Student's Name", "Marks Obtained"]
-            ws_subj.append(headers)
-            
-            # Sort students by marks descending
-            students_in_subject = subject_students_map[code]
-            students_in_subject.sort(key=lambda x: parse_mark(x["marks"]), reverse=True)
-            
-            for rank, student in enumerate(students_in_subject, 1):
-                ws_subj.append([
-                    rank,
-                    student["roll"],
-                    student["name"],
-                    student["marks"]
-                ])
-                
-        # Apply styles
-        arial_14 = Font(name='Arial', size=14)
-        arial_14_bold = Font(name='Arial', size=14, bold=True)
-        center_aligned = Alignment(horizontal='center', vertical='center')
-        
-        for ws in wb.worksheets:
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.row == 1:
-                        cell.font = arial_14_bold
-                    else:
-                        cell.font = arial_14
-                    cell.alignment = center_aligned
-                    
-            for col in ws.columns:
-                max_length = 0
-                if not col: continue
-                col_letter = col[0].column_letter
-                for cell in col:
-                    try:
-                        v = str(cell.value) if cell.value is not None else ""
-                        if len(v) > max_length:
-                            max_length = len(v)
-                    except:
-                        pass
-                ws.column_dimensions[col_letter].width = (max_length + 2) * 1.5
-
-        # Save Excel file per semester
-        base_name = os.path.basename(docx_file).replace('.docx', '')
-        output_file = os.path.join("Information", "docx2xlsx", f"Semester_{base_name}_Results.xlsx")
-        wb.save(output_file)
-        print(f"✅ Saved results for {base_name} as {output_file}\n")
-
-if __name__ == "__main__":
-    main()
+import re
+import zipfile
+from collections import namedtuple, Counter
+import xml.etree.ElementTree as ET
+import openpyxl
+import pandas as pd
+from openpyxl.styles import Font, Alignment, NamedStyle
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.utils import get_column_letter
+import os
+import sys
+import csv
+import json
+import glob
+import time
+import sqlite3
+import functools
+import hashlib
+import argparse
+import concurrent.futures
+from html.parser import HTMLParser
+from pypdf import PdfReader
+import profiling
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+DOCX_FOLDER = os.path.join("Information", "pdf2docx")
+OUTPUT_FOLDER = os.path.join("Information", "docx2xlsx")
+
+# Written by result-saver.py, holds the raw result pages of every fetched student
+RESULT_CACHE_PATH = os.path.join("Information", "Saved Results", "result_cache.sqlite")
+
+PDF_PAGES_PER_TASK = 25  # Pages of a merged semester PDF parsed by one worker process at a time
+
+# How students with equal scores are ranked, as pandas rank methods
+TIE_POLICIES = {
+    "competition": "min",  # 1, 2, 2, 4
+    "dense": "dense",  # 1, 2, 2, 3
+    "ordinal": "first",  # 1, 2, 3, 4 in input order
+}
+STATS_PERCENTILE = 0.9
+SUBJECT_ORDER = ["MAT", "PHY", "CHE", "AE", "SE"]  # Column order of the subjects in the Overall Results sheet
+
+# Every parsed semester, the workbooks are generated from it and result-query.py reads it
+RESULT_DB_PATH = os.path.join(OUTPUT_FOLDER, "results.sqlite")
+PARSER_VERSION = 1  # Bump whenever the extraction changes, so stored semesters are parsed again
+
+EXPORT_FORMATS = ["csv", "parquet", "jsonl"]
+EXPORT_BATCH_ROWS = 10000  # Rows per Parquet row group, the rest of a table is streamed row by row
+
+profiler = profiling.Profiler("excel-maker")
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Text equivalent of run content, the same as python-docx's run.text
+RUN_TEXT = {W + "tab": "\t", W + "ptab": "\t", W + "cr": "\n", W + "noBreakHyphen": "-"}
+
+class ResultPageParser(HTMLParser):
+    """Collects every table row of a result page as a list of cell texts, the same shape row.cells gives for docx."""
+
+    def __init__(self):
+        super().__init__()
+        self.rows = []
+        self.row_stack = []
+        self.cell_stack = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "tr":
+            row = []
+            self.rows.append(row)
+            self.row_stack.append(row)
+        elif tag in ("td", "th") and self.row_stack:
+            try:
+                colspan = max(1, int(dict(attrs).get("colspan") or 1))
+            except ValueError:
+                colspan = 1
+            self.cell_stack.append(([], colspan))
+        elif tag == "br" and self.cell_stack:
+            self.cell_stack[-1][0].append("\n")
+
+    def handle_endtag(self, tag):
+        if tag in ("td", "th") and self.cell_stack and self.row_stack:
+            parts, colspan = self.cell_stack.pop()
+            text = " ".join("".join(parts).split())
+            # A merged cell repeats its text for every grid column it spans
+            self.row_stack[-1].extend([text] * colspan)
+        elif tag == "tr" and self.row_stack:
+            self.row_stack.pop()
+
+    def handle_data(self, data):
+        if self.cell_stack:
+            self.cell_stack[-1][0].append(data)
+
+def parse_carry(text):
+    value = text.rstrip(",")
+    if not value:
+        raise ValueError("no carry over papers")
+    return value
+
+# How every header field of a result table is found:
+#   label:  the value is the next non-empty cell after a cell that is exactly the marker, the first match wins
+#   inline: the value follows the marker inside the same cell, the last match wins
+# parse turns the text into the field value, a ValueError keeps the previous value
+FieldRule = namedtuple("FieldRule", ["field", "kind", "marker", "parse", "default"])
+FIELD_RULES = [
+    FieldRule("name", "label", "Name", str, ""),
+    FieldRule("roll", "label", "Roll No", str, ""),
+    FieldRule("result", "inline", "Result :", str, "FAILED"),
+    FieldRule("sgpa", "inline", "(SGPA) :", float, ""),
+    FieldRule("cgpa", "inline", "(CGPA) :", float, ""),
+    FieldRule("carry", "inline", "Carry Over Paper :", parse_carry, "-"),
+]
+LABEL_RULES = {rule.marker: rule for rule in FIELD_RULES if rule.kind == "label"}
+INLINE_RULES = {rule.marker: rule for rule in FIELD_RULES if rule.kind == "inline"}
+SUBJECT_HEADER = "Obt. Marks"
+SUBJECT_CODE = re.compile(r"^[A-Z]{1,6}\d+[A-Za-z0-9\-\*]*$")
+
+LABEL_MARKERS = frozenset(LABEL_RULES)
+INLINE_MARKERS = re.compile("|".join(re.escape(marker) for marker in INLINE_RULES))
+ROW_MARKERS = re.compile("|".join(re.escape(marker) for marker in [*LABEL_RULES, *INLINE_RULES, SUBJECT_HEADER]))
+ROLL_MARKER = next(rule.marker for rule in FIELD_RULES if rule.field == "roll")
+# Separators that never occur in cell text, so a joined row (or table) can be searched as one string
+CELL_SEPARATOR = "\x1f"
+ROW_SEPARATOR = "\x1e"
+
+def extract_student_record(cells_matrix):
+    """Fills every FIELD_RULES field and the subject marks in one pass, without rescanning the table per field.
+
+    Returns None for tables without a roll number. Fields whose marker the table did not have are listed under "missing".
+    """
+    values = {}
+    found = set()
+    headers = []
+
+    joined_rows = list(map(CELL_SEPARATOR.join, cells_matrix))
+    # Tables without a roll number label are not result pages (e.g. instructions), skip them outright
+    if ROLL_MARKER not in ROW_SEPARATOR.join(joined_rows):
+        return None
+
+    # Only the few rows holding a field marker need a closer look, one search over each joined row finds them
+    search = ROW_MARKERS.search
+    marker_rows = [row_idx for row_idx, joined in enumerate(joined_rows) if search(joined)]
+
+    for row_idx in marker_rows:
+        row = cells_matrix[row_idx]
+        # Merged cells repeat their text, each distinct cell only needs to be looked at once
+        cells = dict.fromkeys(row)
+        if SUBJECT_HEADER in cells:
+            headers.append((row_idx, row.index(SUBJECT_HEADER)))
+        for marker in LABEL_MARKERS.intersection(cells):
+            rule = LABEL_RULES[marker]
+            found.add(rule.field)
+            if rule.field not in values:
+                value = next((other.strip() for other in row[row.index(marker):] if other != marker and other.strip()), None)
+                if value is not None:
+                    values[rule.field] = rule.parse(value)
+        for cell in cells:
+            for marker in INLINE_MARKERS.findall(cell):
+                rule = INLINE_RULES[marker]
+                found.add(rule.field)
+                try:
+                    values[rule.field] = rule.parse(cell.split(marker)[1].strip())
+                except ValueError:
+                    pass
+
+    if not values.get("roll"):
+        return None
+
+    # Rows from a marks header on that start with a subject code hold that subject's marks, up to the next header
+    subjects = {}
+    match_code = SUBJECT_CODE.match
+    for (start, obt_idx), (end, _) in zip(headers, headers[1:] + [(len(cells_matrix), None)]):
+        subjects.update(
+            (row[0], row[obt_idx]) for row in cells_matrix[start:end]
+            if obt_idx < len(row) and row[obt_idx] and match_code(row[0])
+        )
+
+    record = {rule.field: values.get(rule.field, rule.default) for rule in FIELD_RULES}
+    record["subjects"] = subjects
+    record["missing"] = [rule.field for rule in FIELD_RULES if rule.field not in found] + ([] if subjects else ["subjects"])
+    return record
+
+def docx_int(element, path, default):
+    node = element.find(path)
+    try:
+        return int(node.get(W + "val")) if node is not None else default
+    except (TypeError, ValueError):
+        return default
+
+def docx_paragraph_text(paragraph):
+    parts = []
+    for child in paragraph:
+        # Runs directly in the paragraph or inside a hyperlink, like python-docx's paragraph.text
+        runs = [child] if child.tag == W + "r" else child.findall(W + "r") if child.tag == W + "hyperlink" else []
+        for run in runs:
+            for node in run:
+                if node.tag == W + "t":
+                    parts.append(node.text or "")
+                elif node.tag == W + "br":
+                    parts.append("\n" if node.get(W + "type", "textWrapping") == "textWrapping" else "")
+                else:
+                    parts.append(RUN_TEXT.get(node.tag, ""))
+    return "".join(parts)
+
+def docx_cell_text(tc):
+    return "\n".join(docx_paragraph_text(paragraph) for paragraph in tc.findall(W + "p"))
+
+def docx_table_rows(tbl):
+    """Rows of one <w:tbl> as lists of cell text, laid out exactly like python-docx's row.cells."""
+    above = {}
+    for tr in tbl.findall(W + "tr"):
+        offset = docx_int(tr, f"{W}trPr/{W}gridBefore", 0)
+        row = []
+        current = {}
+        for tc in tr.findall(W + "tc"):
+            span = max(1, docx_int(tc, f"{W}tcPr/{W}gridSpan", 1))
+            v_merge = tc.find(f"{W}tcPr/{W}vMerge")
+            if v_merge is not None and v_merge.get(W + "val", "continue") == "continue" and offset in above:
+                # Continuation of a vertical merge repeats the cell it started in
+                cell = above[offset]
+            else:
+                cell = (span, docx_cell_text(tc))
+            # A horizontally merged cell repeats its text for every grid column it spans
+            row.extend([cell[1]] * cell[0])
+            current[offset] = cell
+            offset += cell[0]
+        above = current
+        yield row
+
+def iter_docx_tables(docx_file):
+    """Streams the top-level tables of word/document.xml, only one table is held in memory at a time."""
+    with zipfile.ZipFile(docx_file) as archive, archive.open("word/document.xml") as document:
+        stack = []
+        for event, element in ET.iterparse(document, events=("start", "end")):
+            if event == "start":
+                stack.append(element)
+                continue
+            stack.pop()
+            # Only children of <w:body> are finished and dropped, nested tables stay part of their cell
+            if len(stack) >= 2 and stack[-1].tag == W + "body" and stack[-2].tag == W + "document":
+                if element.tag == W + "tbl":
+                    yield list(docx_table_rows(element))
+                stack[-1].remove(element)
+
+def extract_from_docx(docx_file):
+    student_data_list = []
+    all_subject_codes = set()
+    
+    for table_rows in iter_docx_tables(docx_file):
+        # Replaces newlines with spaces and truncates whitespaces
+        cells_matrix = [[text.strip().replace('\n', ' ') for text in row] for row in table_rows]
+            
+        student = extract_student_record(cells_matrix)
+        if student is None:
+            continue
+            
+        all_subject_codes.update(student["subjects"].keys())
+        student_data_list.append(student)
+        
+    return student_data_list, all_subject_codes
+
+def extract_from_html(html):
+    # One result page holds exactly one student, spread over several (possibly nested) tables
+    parser = ResultPageParser()
+    parser.feed(html)
+    parser.close()
+    return extract_student_record(parser.rows)
+
+def extract_from_html_pages(html_pages):
+    student_data_list = []
+    all_subject_codes = set()
+    
+    for html in html_pages:
+        student = extract_from_html(html)
+        if student is None:
+            continue
+        all_subject_codes.update(student["subjects"].keys())
+        student_data_list.append(student)
+        
+    return student_data_list, all_subject_codes
+
+def read_html_folder(folder):
+    for file_name in sorted(os.listdir(folder)):
+        if file_name.lower().endswith(".html"):
+            with open(os.path.join(folder, file_name), "r", encoding="utf-8") as f:
+                yield f.read()
+
+def read_cached_html(semester):
+    # Latest cached result page of every student for this semester, in roll order
+    conn = sqlite3.connect(RESULT_CACHE_PATH)
+    try:
+        rows = conn.execute(
+            "SELECT e.roll, b.data FROM entries e JOIN blobs b ON b.hash = e.hash "
+            "WHERE e.semester = ? AND e.kind = 'html' ORDER BY e.roll, e.fetched_at",
+            (semester,)
+        ).fetchall()
+    finally:
+        conn.close()
+    latest = {}
+    for roll, data in rows:
+        latest[roll] = data
+    for roll in sorted(latest):
+        yield latest[roll].decode("utf-8")
+
+def cached_semesters():
+    if not os.path.exists(RESULT_CACHE_PATH):
+        return []
+    conn = sqlite3.connect(RESULT_CACHE_PATH)
+    try:
+        rows = conn.execute("SELECT DISTINCT semester FROM entries WHERE kind = 'html'").fetchall()
+    finally:
+        conn.close()
+    return sorted((row[0] for row in rows), key=lambda sem: (len(sem), sem))
+
+def extract_pdf_rows(page):
+    """Rebuilds the table rows of one result page from the position of every text fragment."""
+    fragments = []
+
+    def visitor(text, cm, tm, font_dict, font_size):
+        if not text.strip():
+            return
+        # Text position in page space, and a rough width since pypdf does not report glyph widths
+        scale = abs(tm[0] * cm[0]) or 1
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        size = (font_size or 10) * scale
+        for line in text.split("\n"):
+            if line.strip():
+                fragments.append((round(y, 0), x, x + len(line.rstrip()) * size * 0.5, size, line.strip()))
+            y -= size
+
+    page.extract_text(visitor_text=visitor)
+
+    # Fragments on the same baseline form a row, read top to bottom
+    lines = {}
+    for y, x, end, size, text in fragments:
+        key = next((k for k in lines if abs(k - y) <= 2), y)
+        lines.setdefault(key, []).append((x, end, size, text))
+
+    rows = []
+    for y in sorted(lines, reverse=True):
+        cells = []
+        for x, end, size, text in sorted(lines[y]):
+            # Fragments separated by less than a character or so belong to the same cell
+            if cells and x - cells[-1][1] < size:
+                cells[-1] = (cells[-1][0], max(end, cells[-1][1]), cells[-1][2] + " " + text)
+            else:
+                cells.append((x, end, text))
+        rows.append(cells)
+
+    # Rows below the marks header are aligned to its columns so "Obt. Marks" keeps its index
+    cells_matrix = []
+    header = None
+    for cells in rows:
+        texts = [" ".join(text.split()) for x, end, text in cells]
+        if "Obt. Marks" in texts:
+            header = cells
+        elif header is not None and len(cells) > 1:
+            aligned = [""] * len(header)
+            for x, end, text in cells:
+                column = min(range(len(header)), key=lambda i: abs(header[i][0] - x) if header[i][0] <= x + 1 else float("inf"))
+                aligned[column] = (aligned[column] + " " + text).strip()
+            texts = [" ".join(text.split()) for text in aligned]
+        cells_matrix.append(texts)
+    return cells_matrix
+
+def extract_pdf_pages(pdf_file, start, end):
+    # Runs in a worker process, every page of a merged semester PDF is one student
+    reader = PdfReader(pdf_file)
+    students = []
+    unparsed_pages = []
+    for page_number in range(start, end):
+        student = extract_student_record(extract_pdf_rows(reader.pages[page_number]))
+        if student is not None:
+            students.append(student)
+        else:
+            unparsed_pages.append(page_number + 1)
+    return students, unparsed_pages
+
+def collect_pdf_students(page_groups):
+    student_data_list = []
+    all_subject_codes = set()
+    unparsed_pages = []
+    for students, unparsed in page_groups:
+        for student in students:
+            all_subject_codes.update(student["subjects"].keys())
+            student_data_list.append(student)
+        unparsed_pages.extend(unparsed)
+    return student_data_list, all_subject_codes, unparsed_pages
+
+def extract_from_pdf(pdf_file, workers=None):
+    """Parses the pages of a merged PDF on a pool of worker processes, or in this process when workers is 1.
+
+    Returns (students, subject codes, page numbers no student record could be read from). A page whose rows are each
+    drawn as one text object comes out as whole-row fragments that cannot be split into cells, so it is reported
+    there instead of being dropped unnoticed.
+    """
+    page_count = len(PdfReader(pdf_file).pages)
+    starts = list(range(0, page_count, PDF_PAGES_PER_TASK))
+    ends = [min(start + PDF_PAGES_PER_TASK, page_count) for start in starts]
+    if workers == 1:
+        return collect_pdf_students(map(extract_pdf_pages, [pdf_file] * len(starts), starts, ends))
+
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        # map keeps the page order of the merged PDF
+        return collect_pdf_students(executor.map(extract_pdf_pages, [pdf_file] * len(starts), starts, ends))
+
+def hash_files(paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode("utf-8") + b"\0")
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_cached_html(semester):
+    # The cache already stores a content hash per page, no need to read the pages themselves
+    conn = sqlite3.connect(RESULT_CACHE_PATH)
+    try:
+        rows = conn.execute(
+            "SELECT roll, hash FROM entries WHERE semester = ? AND kind = 'html' ORDER BY roll, fetched_at",
+            (semester,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return hashlib.sha256(repr(rows).encode("utf-8")).hexdigest()
+
+def hash_html_folder(folder):
+    return hash_files(os.path.join(folder, f) for f in sorted(os.listdir(folder)) if f.lower().endswith(".html"))
+
+def extract_from_html_folder(folder):
+    return extract_from_html_pages(read_html_folder(folder))
+
+def extract_from_cached_html(semester):
+    return extract_from_html_pages(read_cached_html(semester))
+
+def natural_key(path):
+    # "10.docx" after "9.docx"
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", path)]
+
+def expand_inputs(patterns, extension):
+    """Every file matched by the given paths, glob patterns and folders (searched recursively), without duplicates."""
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = glob.glob(os.path.join(glob.escape(pattern), "**", "*" + extension), recursive=True)
+        elif any(char in pattern for char in "*?["):
+            matches = glob.glob(pattern, recursive=True)
+        else:
+            matches = [pattern]  # Kept even when missing, so it is reported instead of silently ignored
+        # Word leaves "~$" lock files next to open documents
+        paths.extend(sorted((m for m in matches if not os.path.basename(m).startswith("~$")), key=natural_key))
+    return list(dict.fromkeys(os.path.normpath(path) for path in paths))
+
+def batch_names(paths):
+    """Output base name of every input file: its file name, or its path below the common folder when file names collide."""
+    stems = [os.path.splitext(os.path.basename(path))[0] for path in paths]
+    counts = Counter(stems)
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths]) if paths else ""
+    return [
+        stem if counts[stem] == 1 else re.sub(r"[\\/]+", "_", os.path.splitext(os.path.relpath(os.path.abspath(path), root))[0])
+        for stem, path in zip(stems, paths)
+    ]
+
+def find_sources(source, inputs=None):
+    """Returns (base_name, description, loader, fingerprint) for every semester available from the chosen input.
+
+    inputs are paths, glob patterns or folders of docx (or pdf) files to use instead of the default locations.
+    loader returns the parsed (students, subject codes) and fingerprint a hash of the input's content, used as the parse
+    cache key. Both are picklable, so they can run in a worker process.
+    """
+    if source == "html":
+        saved_results = os.path.join("Information", "Saved Results")
+        folders = sorted(f for f in os.listdir(saved_results) if f.startswith("Saved_HTML_Sem_")) if os.path.isdir(saved_results) else []
+        return [
+            (folder_name[len("Saved_HTML_Sem_"):], os.path.join(saved_results, folder_name),
+             functools.partial(extract_from_html_folder, os.path.join(saved_results, folder_name)),
+             functools.partial(hash_html_folder, os.path.join(saved_results, folder_name)))
+            for folder_name in folders
+        ]
+    if source == "cache":
+        return [
+            (sem, f"{RESULT_CACHE_PATH} (Semester {sem})",
+             functools.partial(extract_from_cached_html, sem),
+             functools.partial(hash_cached_html, sem))
+            for sem in cached_semesters()
+        ]
+    if source == "pdf":
+        if inputs:
+            paths = expand_inputs(inputs, ".pdf")
+        else:
+            saved_results = os.path.join("Information", "Saved Results")
+            pdf_names = [f for f in os.listdir(saved_results) if re.match(r"^\d+\.pdf$", f)] if os.path.isdir(saved_results) else []
+            paths = [os.path.join(saved_results, pdf_name) for pdf_name in sorted(pdf_names, key=natural_key)]
+        extract = extract_from_pdf
+    else:
+        paths = expand_inputs(inputs or [os.path.join(glob.escape(DOCX_FOLDER), "*.docx")], ".docx")
+        extract = extract_from_docx
+    return [
+        (base_name, path, functools.partial(extract, path), functools.partial(hash_files, [path]))
+        for base_name, path in zip(batch_names(paths), paths)
+    ]
+
+class ResultStore:
+    """SQLite database of every parsed semester: students, their semester results, subject marks and carry over papers.
+
+    Each semester is replaced as a whole, so loading the same input again leaves the database unchanged. The workbooks
+    are generated from it, and result-query.py answers lookups across semesters from it.
+    """
+
+    def __init__(self, path=RESULT_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # The worker processes of a batch share the file, each waits its turn to write
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS semesters (
+                semester TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                input TEXT NOT NULL,
+                parse_key TEXT NOT NULL,
+                workbook_key TEXT,
+                loaded_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS students (
+                roll TEXT PRIMARY KEY,
+                name TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                semester TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                roll TEXT NOT NULL,
+                result TEXT NOT NULL,
+                sgpa REAL,
+                cgpa REAL,
+                carry TEXT NOT NULL,
+                missing TEXT NOT NULL,
+                PRIMARY KEY (semester, position)
+            );
+            CREATE TABLE IF NOT EXISTS marks (
+                semester TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                roll TEXT NOT NULL,
+                code TEXT NOT NULL,
+                mark TEXT NOT NULL,
+                PRIMARY KEY (semester, position, code)
+            );
+            CREATE TABLE IF NOT EXISTS carry_overs (
+                semester TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                roll TEXT NOT NULL,
+                code TEXT NOT NULL,
+                PRIMARY KEY (semester, position, code)
+            );
+            CREATE INDEX IF NOT EXISTS results_roll ON results(roll);
+            CREATE INDEX IF NOT EXISTS marks_roll ON marks(roll);
+            CREATE INDEX IF NOT EXISTS marks_code ON marks(code, semester);
+            CREATE INDEX IF NOT EXISTS carry_overs_roll ON carry_overs(roll);
+            CREATE INDEX IF NOT EXISTS carry_overs_code ON carry_overs(code, semester);
+        """)
+        self.conn.commit()
+
+    def semester_keys(self, semester):
+        """Returns (parse_key, workbook_key) of a loaded semester, or None if it was never loaded."""
+        return self.conn.execute("SELECT parse_key, workbook_key FROM semesters WHERE semester = ?", (semester,)).fetchone()
+
+    def save_semester(self, semester, source, input_name, parse_key, student_data_list):
+        # position keeps the input order (and any student listed twice), the workbooks rank ties in that order
+        with self.conn:
+            for table in ("carry_overs", "marks", "results"):
+                self.conn.execute(f"DELETE FROM {table} WHERE semester = ?", (semester,))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO semesters (semester, source, input, parse_key, workbook_key, loaded_at) VALUES (?, ?, ?, ?, NULL, ?)",
+                (semester, source, input_name, parse_key, time.time())
+            )
+            self.conn.executemany(
+                "INSERT INTO students (roll, name) VALUES (?, ?) "
+                "ON CONFLICT(roll) DO UPDATE SET name = excluded.name WHERE excluded.name != ''",
+                [(student["roll"], student["name"]) for student in student_data_list]
+            )
+            self.conn.executemany(
+                "INSERT INTO results (semester, position, roll, result, sgpa, cgpa, carry, missing) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (semester, position, student["roll"], student["result"], student["sgpa"] if student["sgpa"] != "" else None,
+                     student["cgpa"] if student["cgpa"] != "" else None, student["carry"], ",".join(student["missing"]))
+                    for position, student in enumerate(student_data_list)
+                ]
+            )
+            self.conn.executemany(
+                "INSERT INTO marks (semester, position, roll, code, mark) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (semester, position, student["roll"], code, mark)
+                    for position, student in enumerate(student_data_list)
+                    for code, mark in student["subjects"].items()
+                ]
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO carry_overs (semester, position, roll, code) VALUES (?, ?, ?, ?)",
+                [
+                    (semester, position, student["roll"], code)
+                    for position, student in enumerate(student_data_list)
+                    for code in re.split(r"[,\s]+", student["carry"]) if code and code != "-"
+                ]
+            )
+
+    def load_semester(self, semester):
+        """Returns (students, subject codes) of a semester, exactly as they were parsed."""
+        subjects = {}
+        for position, code, mark in self.conn.execute(
+            "SELECT position, code, mark FROM marks WHERE semester = ? ORDER BY position, rowid", (semester,)
+        ):
+            subjects.setdefault(position, {})[code] = mark
+        student_data_list = [
+            {
+                "name": name, "roll": roll, "result": result,
+                "sgpa": sgpa if sgpa is not None else "", "cgpa": cgpa if cgpa is not None else "", "carry": carry,
+                "subjects": subjects.get(position, {}), "missing": missing.split(",") if missing else []
+            }
+            for position, roll, name, result, sgpa, cgpa, carry, missing in self.conn.execute(
+                "SELECT r.position, r.roll, s.name, r.result, r.sgpa, r.cgpa, r.carry, r.missing "
+                "FROM results r JOIN students s ON s.roll = r.roll WHERE r.semester = ? ORDER BY r.position",
+                (semester,)
+            )
+        ]
+        return student_data_list, {code for marks in subjects.values() for code in marks}
+
+    def set_workbook_key(self, semester, workbook_key):
+        with self.conn:
+            self.conn.execute("UPDATE semesters SET workbook_key = ? WHERE semester = ?", (workbook_key, semester))
+
+    def close(self):
+        self.conn.close()
+
+class ResultSheet:
+    """Rows of one worksheet, with every column's widest value tracked as rows are added."""
+
+    def __init__(self, title):
+        self.title = title
+        self.rows = []
+        self.widths = []
+
+    def append(self, row):
+        self.rows.append(row)
+        widths = self.widths
+        for i, value in enumerate(row):
+            length = len(str(value)) if value is not None else 0
+            if i == len(widths):
+                widths.append(length)
+            elif length > widths[i]:
+                widths[i] = length
+
+def write_workbook(sheets, output_file):
+    # Write-only workbooks stream every row straight to disk, column widths have to be known before the first row
+    wb = openpyxl.Workbook(write_only=True)
+    header_style = NamedStyle(name="Result Header", font=Font(name='Arial', size=14, bold=True), alignment=Alignment(horizontal='center', vertical='center'))
+    body_style = NamedStyle(name="Result Body", font=Font(name='Arial', size=14), alignment=Alignment(horizontal='center', vertical='center'))
+    wb.add_named_style(header_style)
+    wb.add_named_style(body_style)
+
+    for sheet in sheets:
+        ws = wb.create_sheet(title=sheet.title)
+        for i, width in enumerate(sheet.widths, 1):
+            ws.column_dimensions[get_column_letter(i)].width = (width + 2) * 1.5
+        # Resolve each named style once, every cell of a row then shares it (write-only cells are never changed later)
+        styles = []
+        for style in (header_style, body_style):
+            template = WriteOnlyCell(ws)
+            template.style = style.name
+            styles.append(template._style)
+        for row_number, row in enumerate(sheet.rows):
+            style = styles[0] if row_number == 0 else styles[1]
+            cells = []
+            for value in row:
+                cell = WriteOnlyCell(ws, value=value)
+                cell._style = style
+                cells.append(cell)
+            ws.append(cells)
+
+    wb.save(output_file)
+
+class TableExport:
+    """Writes the rows of one table to every requested export format as they are produced. Blank cells become nulls.
+
+    types maps a column to "int" or "float", every other column is text.
+    """
+
+    def __init__(self, base_path, formats, headers, types=None):
+        self.headers = headers
+        self.types = [(types or {}).get(header, "str") for header in headers]
+        self.paths = [f"{base_path}.{fmt}" for fmt in formats]
+        self.csv_file = self.csv_writer = self.jsonl_file = self.parquet_writer = None
+        self.batch = []
+        if "csv" in formats:
+            # utf-8-sig so Excel shows the names correctly
+            self.csv_file = open(f"{base_path}.csv", "w", newline="", encoding="utf-8-sig")
+            self.csv_writer = csv.writer(self.csv_file)
+            self.csv_writer.writerow(headers)
+        if "jsonl" in formats:
+            self.jsonl_file = open(f"{base_path}.jsonl", "w", encoding="utf-8")
+        if "parquet" in formats:
+            arrow_types = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}
+            self.schema = pa.schema([(header, arrow_types[kind]) for header, kind in zip(headers, self.types)])
+            self.parquet_writer = pq.ParquetWriter(f"{base_path}.parquet", self.schema)
+
+    def append(self, row):
+        if self.csv_writer is not None:
+            self.csv_writer.writerow(row)
+        if self.jsonl_file is None and self.parquet_writer is None:
+            return
+        values = [None if value == "" else (str(value) if kind == "str" else value) for value, kind in zip(row, self.types)]
+        if self.jsonl_file is not None:
+            self.jsonl_file.write(json.dumps(dict(zip(self.headers, values)), ensure_ascii=False) + "\n")
+        if self.parquet_writer is not None:
+            self.batch.append(values)
+            if len(self.batch) >= EXPORT_BATCH_ROWS:
+                self.flush()
+
+    def flush(self):
+        if self.batch:
+            columns = [list(column) for column in zip(*self.batch)]
+            self.parquet_writer.write_table(pa.Table.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, self.schema)], schema=self.schema
+            ))
+            self.batch = []
+
+    def close(self):
+        if self.csv_file is not None:
+            self.csv_file.close()
+        if self.jsonl_file is not None:
+            self.jsonl_file.close()
+        if self.parquet_writer is not None:
+            self.flush()
+            self.parquet_writer.close()
+
+def subject_sort_key(code):
+    # Core subjects first in SUBJECT_ORDER, everything else after them alphabetically
+    for i, prefix in enumerate(SUBJECT_ORDER):
+        if code.startswith(prefix):
+            return (i, code)
+    return (len(SUBJECT_ORDER), code)
+
+def rank_students(student_data_list, subject_codes, tie_policy="competition"):
+    """Ranks every student on SGPA, CGPA and each subject in one vectorized pass.
+
+    Returns (order, scores, ranks, taken). order lists the students best SGPA first, and the other three follow it row by
+    row: the numeric score in "sgpa", "cgpa" and every subject (columns) with absent or non-numeric marks as NaN, the
+    matching ranks (NaN where there is no score to rank), and which subjects each student has a mark of any kind in.
+    """
+    columns = ["sgpa", "cgpa"] + list(subject_codes)
+    raw = pd.DataFrame.from_records(
+        [{"sgpa": student["sgpa"], "cgpa": student["cgpa"], **student["subjects"]} for student in student_data_list],
+        columns=columns
+    )
+    # One conversion of the whole matrix, "AB", "" and missing marks all become NaN
+    values = pd.to_numeric(pd.Series(raw.to_numpy().ravel()), errors="coerce").to_numpy().reshape(raw.shape)
+    scores = pd.DataFrame(values, columns=columns)
+    # Students in overall rank order, so ordinal ties in every subject follow the overall list
+    order = scores["sgpa"].sort_values(ascending=False, kind="stable", na_position="last").index
+    scores = scores.loc[order].reset_index(drop=True)
+    taken = raw.loc[order, list(subject_codes)].notna().reset_index(drop=True)
+    ranks = scores.rank(method=TIE_POLICIES[tie_policy], ascending=False, na_option="keep")
+    return order.tolist(), scores, ranks, taken
+
+def ranking_order(ranks):
+    # Best first, students without a score at the bottom in input order
+    return ranks.sort_values(kind="stable", na_position="last").index
+
+def rank_value(rank):
+    return "" if pd.isna(rank) else int(rank)
+
+def score_statistics(scores):
+    """Students, mean, median, max, min and a high percentile of every score column, computed column-wise."""
+    return pd.DataFrame({
+        "Students": scores.count(),
+        "Mean": scores.mean().round(2),
+        "Median": scores.median().round(2),
+        "Max": scores.max(),
+        "Min": scores.min(),
+        f"{int(STATS_PERCENTILE * 100)}th Percentile": scores.quantile(STATS_PERCENTILE).round(2),
+    })
+
+def build_sheets(base_name, student_data_list, sorted_subject_codes, ranking, output_base=None, exports=()):
+    """Rows of the Overall Results, Subject Statistics and subject sheets, from the result of rank_students.
+
+    The overall and long-format tables are also streamed to output_base_Overall/_Marks in every export format.
+    """
+    order, scores, ranks, taken = ranking
+    student_data_list = [student_data_list[idx] for idx in order]
+    sheets = []
+        
+    # 1. Overall Results Sheet
+    ws_overall = ResultSheet("Overall Results")
+    sheets.append(ws_overall)
+    
+    # First semester results have no CGPA yet
+    has_cgpa = bool(scores["cgpa"].notna().any())
+    
+    if not has_cgpa:
+        headers = ["Rank", "Roll Number", "Student's Name", "SGPA", "Result"] + sorted_subject_codes + ["Carry Over Paper"]
+    else:
+        headers = ["Rank", "Roll Number", "Student's Name", "SGPA", "CGPA", "Result"] + sorted_subject_codes + ["Carry Over Paper"]
+        
+    ws_overall.append(headers)
+    # Exported tables are written row by row as they are laid out, blanks become nulls
+    overall_export = TableExport(f"{output_base}_Overall", exports, headers, {"Rank": "int", "SGPA": "float", "CGPA": "float"})
+    marks_export = TableExport(f"{output_base}_Marks", exports, ["Semester", "Roll Number", "Subject", "Marks Obtained", "Subject Rank"], {"Subject Rank": "int"})
+    
+    for idx in ranking_order(ranks["sgpa"]):
+        student = student_data_list[idx]
+        if not has_cgpa:
+            row_data = [
+                rank_value(ranks.at[idx, "sgpa"]),
+                student["roll"],
+                student["name"],
+                student["sgpa"],
+                student["result"]
+            ]
+        else:
+            row_data = [
+                rank_value(ranks.at[idx, "sgpa"]),
+                student["roll"],
+                student["name"],
+                student["sgpa"],
+                student["cgpa"],
+                student["result"]
+            ]
+            
+        for code in sorted_subject_codes:
+            mark = student["subjects"].get(code, "")
+            row_data.append(mark)
+            
+        row_data.append(student["carry"])
+        ws_overall.append(row_data)
+        overall_export.append(row_data)
+    overall_export.close()
+
+    # 2. Statistics of SGPA, CGPA and every subject
+    ws_stats = ResultSheet("Subject Statistics")
+    sheets.append(ws_stats)
+    stats = score_statistics(scores)
+    stats.index = ["SGPA", "CGPA"] + sorted_subject_codes
+    if not has_cgpa:
+        stats = stats.drop(index="CGPA")
+    ws_stats.append(["Subject"] + list(stats.columns))
+    for code, row in stats.iterrows():
+        ws_stats.append([code] + ["" if pd.isna(value) else (int(value) if name == "Students" else float(value)) for name, value in row.items()])
+    
+    # 3. Subject Ranks Sheets
+    for code in sorted_subject_codes:
+        # Students who have the subject at all, non-numeric marks (e.g. absent) are listed last without a rank
+        subject_ranks = ranks[code][taken[code]]
+        if subject_ranks.empty:
+            continue
+
+        # Sanitize sheet name if it exceeds 31 chars or has invalid chars
+        safe_sheet_name = re.sub(r'[\\*?:/\[\]]', '_', code)[:31]
+        ws_subj = ResultSheet(safe_sheet_name)
+        sheets.append(ws_subj)
+        
+        headers = ["Subject Rank", "Roll Number", "Student's Name", "Marks Obtained"]
+        ws_subj.append(headers)
+        
+        for idx in ranking_order(subject_ranks):
+            student = student_data_list[idx]
+            rank = rank_value(ranks.at[idx, code])
+            ws_subj.append([
+                rank,
+                student["roll"],
+                student["name"],
+                student["subjects"][code]
+            ])
+            marks_export.append([base_name, student["roll"], code, student["subjects"][code], rank])
+    marks_export.close()
+    return sheets
+
+def build_workbook(store, source, base_name, input_name, load_records, fingerprint, force=False, tie_policy="competition", exports=(), xlsx=True):
+    """Loads one semester into the result store and writes its workbook (and any exports) from there.
+
+    Returns (status, log lines): "saved", "skipped", "empty" or "failed". Runs in a worker process during a batch, so
+    everything is reported through the returned log instead of printed.
+    """
+    if source in ("docx", "pdf") and not os.path.exists(input_name):
+        return "failed", [f"File not found: {input_name}"]
+    log = []
+
+    output_base = os.path.join(OUTPUT_FOLDER, f"Semester_{base_name}")
+    output_file = f"{output_base}_Results.xlsx"
+    output_files = ([output_file] if xlsx else []) + [f"{output_base}_{table}.{fmt}" for table in ("Overall", "Marks") for fmt in exports]
+    with profiler.stage("fingerprint"):
+        key = f"{PARSER_VERSION}:{fingerprint()}"
+    stored_keys = store.semester_keys(base_name)
+    # The workbook also depends on the options that change its content
+    workbook_key = f"{key}|ties={tie_policy}|outputs={','.join(map(os.path.basename, output_files))}"
+    if stored_keys is not None and stored_keys[0] == key:
+        # Unchanged input: skip the parse, and the workbook too if it was already written from it
+        if not force and stored_keys[1] == workbook_key and all(os.path.exists(path) for path in output_files):
+            return "skipped", [f"⏭️ {input_name} is unchanged, {', '.join(output_files)} up to date."]
+        log.append(f"♻️ Reusing stored records of {input_name}...")
+    else:
+        log.append(f"Processing {input_name}...")
+        with profiler.stage("parse"):
+            # PDFs also return the pages no record could be read from
+            student_data_list, _, *unparsed = load_records()
+        if unparsed and unparsed[0]:
+            pages = unparsed[0]
+            log.append(f"⚠️ {len(pages)} page(s) gave no student record and are left out: page "
+                       + ", ".join(map(str, pages[:10])) + (", ..." if len(pages) > 10 else ""))
+        with profiler.stage("store"):
+            store.save_semester(base_name, source, input_name, key, student_data_list)
+    with profiler.stage("store"):
+        student_data_list, all_subject_codes = store.load_semester(base_name)
+
+    if not student_data_list:
+        return "empty", log + [f"No student data found in {input_name}."]
+
+    missing = Counter(field for student in student_data_list for field in student["missing"])
+    if missing["cgpa"] == len(student_data_list):
+        del missing["cgpa"]  # No CGPA at all is a first semester, not a parsing problem
+    if missing:
+        log.append("⚠️ Missing fields: " + ", ".join(f"{field} in {count} result(s)" for field, count in missing.most_common()))
+
+    sorted_subject_codes = sorted(all_subject_codes, key=subject_sort_key)
+    with profiler.stage("rank"):
+        ranking = rank_students(student_data_list, sorted_subject_codes, tie_policy)
+    with profiler.stage("sheets"):
+        sheets = build_sheets(base_name, student_data_list, sorted_subject_codes, ranking, output_base, exports)
+
+    # Save Excel file per semester
+    if xlsx:
+        with profiler.stage("write"):
+            write_workbook(sheets, output_file)
+    store.set_workbook_key(base_name, workbook_key)
+    return "saved", log + [f"✅ Saved results for {base_name} as {', '.join(output_files)}"]
+
+def timed_build(task):
+    """build_workbook with its wall time. Errors are reported in the log instead of raised, so the batch goes on."""
+    start = time.perf_counter()
+    store = None
+    try:
+        store = ResultStore()
+        status, log = build_workbook(store, *task)
+    except Exception as e:
+        status, log = "failed", [f"❌ {task[2]}: {type(e).__name__}: {e}"]
+    finally:
+        if store is not None:
+            store.close()
+    return status, log, time.perf_counter() - start
+
+def pooled_build(task):
+    # Worker process side of run_batch: the stage timers go back to the parent with the outcome. A forked worker starts
+    # with a copy of the parent's totals, so it only reports what this task added
+    profiler.reset()
+    return timed_build(task), profiler.drain()
+
+def run_batch(tasks, jobs):
+    """Yields (task, (status, log, seconds)) as each semester finishes, on a process pool when there is more than one job."""
+    if jobs <= 1:
+        for task in tasks:
+            yield task, timed_build(task)
+        return
+    with concurrent.futures.ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(pooled_build, task): task for task in tasks}
+        for future in concurrent.futures.as_completed(futures):
+            task = futures[future]
+            try:
+                outcome, stages = future.result()
+                profiler.merge(stages)
+            except Exception as e:
+                # The worker itself died (e.g. killed for running out of memory)
+                outcome = ("failed", [f"❌ {task[2]}: {type(e).__name__}: {e}"], 0.0)
+            yield task, outcome
+
+def main(source="docx", force=False, tie_policy="competition", inputs=None, jobs=None, exports=(), xlsx=True):
+    """Builds the workbook of every semester found, in parallel. Returns the number of inputs that failed."""
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    
+    with profiler.stage("find inputs"):
+        sources = find_sources(source, inputs)
+    if not sources:
+        print(f"No {source} input found.")
+        return 0
+    
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(sources)))
+    if source == "pdf" and jobs > 1:
+        # Each semester already has its own batch process, its pages share the remaining cores instead of every
+        # semester starting a pool as large as the machine
+        page_workers = max(1, (os.cpu_count() or 1) // jobs)
+        sources = [(base_name, input_name, functools.partial(load_records, workers=page_workers), fingerprint) for base_name, input_name, load_records, fingerprint in sources]
+    tasks = [(source, base_name, input_name, load_records, fingerprint, force, tie_policy, exports, xlsx) for base_name, input_name, load_records, fingerprint in sources]
+    if jobs > 1:
+        print(f"🚀 Building {len(tasks)} workbooks on {jobs} processes...\n")
+
+    start = time.perf_counter()
+    statuses = Counter()
+    failed = []
+    for task, (status, log, seconds) in run_batch(tasks, jobs):
+        statuses[status] += 1
+        if status == "failed":
+            failed.append(task[2])
+        print("\n".join(log) + f" ({seconds:.2f}s)\n")
+
+    print(f"📊 {len(tasks)} input(s) in {time.perf_counter() - start:.2f}s: " + ", ".join(f"{count} {status}" for status, count in statuses.most_common()))
+    for input_name in failed:
+        print(f"   ❌ {input_name}")
+    return len(failed)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build ranked Excel result sheets for every semester.")
+    parser.add_argument("inputs", nargs="*",
+                        help="docx files, glob patterns or folders to convert (or pdf files with --source pdf). Default: every .docx in Information/pdf2docx/")
+    parser.add_argument("--source", choices=["docx", "pdf", "html", "cache"], default="docx",
+                        help="docx: Information/pdf2docx/*.docx (default). pdf: merged Information/Saved Results/<n>.pdf, read locally. html: result pages saved by result-saver.py --mode http. cache: result pages in result-saver.py's result cache.")
+    parser.add_argument("--tie-policy", choices=list(TIE_POLICIES), default="competition",
+                        help="How equal scores are ranked. competition: 1, 2, 2, 4 (default). dense: 1, 2, 2, 3. ordinal: 1, 2, 3, 4 in input order.")
+    parser.add_argument("--force", action="store_true",
+                        help="Rewrite every workbook, even when its input did not change since the last run")
+    parser.add_argument("--jobs", type=int, default=None,
+                        help="Semesters processed at the same time, each in its own process (default: one per CPU core)")
+    parser.add_argument("--export", action="append", choices=EXPORT_FORMATS, default=[],
+                        help="Also write the overall table and a long (roll, subject, marks, rank) table in this format, can be repeated")
+    parser.add_argument("--no-xlsx", action="store_true", help="Only write the --export files, no Excel workbooks")
+    profiling.add_argument(parser)
+    args = parser.parse_args()
+    if args.inputs and args.source not in ("docx", "pdf"):
+        parser.error(f"input files cannot be given with --source {args.source}")
+    if args.no_xlsx and not args.export:
+        parser.error("--no-xlsx needs at least one --export format")
+    if "parquet" in args.export and pa is None:
+        parser.error("--export parquet needs pyarrow (pip install pyarrow)")
+    exports = list(dict.fromkeys(args.export))
+    try:
+        profiler.start(args.profile)
+    except ValueError as e:
+        parser.error(str(e))
+    sys.exit(1 if main(args.source, args.force, args.tie_policy, args.inputs, args.jobs, exports, not args.no_xlsx) else 0)
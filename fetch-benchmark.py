@@ -0,0 +1,219 @@
+# Measures result-saver.py fetch throughput against a local mock-portal.py, no real portal needed
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import functools
+import threading
+import collections
+import subprocess
+import statistics
+import importlib.util
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+def load_script(file_name):
+    # The scripts have dashes in their names, so they cannot be imported the usual way
+    module_name = file_name.replace("-", "_").replace(".py", "")
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(os.path.dirname(os.path.abspath(__file__)), file_name))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+class RssSampler:
+    """Tracks the peak resident memory of this process and all its children (e.g. Chrome)."""
+
+    def __init__(self, interval=0.2):
+        self.interval = interval
+        self.peak = 0
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+
+    def sample(self):
+        process = psutil.Process()
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        self.peak = max(self.peak, total)
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        if psutil:
+            self.sample()
+            self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        if psutil:
+            self.stop_event.set()
+            self.thread.join()
+            self.sample()
+        elif resource:
+            # Without psutil only this process and the largest reaped child are known
+            scale = 1 if sys.platform == "darwin" else 1024
+            self.peak = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) * scale
+
+def synthetic_students(result_saver, students):
+    return tuple(result_saver.StudentJob(str(2300001 + i).zfill(6), f"{(i % 28) + 1:02d}-{(i % 12) + 1:02d}-2004") for i in range(students))
+
+class LookupLog:
+    """Times every portal lookup result-saver.py makes, by wrapping its fetch functions."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = []  # (seconds, succeeded)
+
+    def wrap(self, fetch):
+        @functools.wraps(fetch)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            succeeded = False
+            try:
+                result = fetch(*args, **kwargs)
+                succeeded = True
+                return result
+            finally:
+                with self.lock:
+                    self.samples.append((time.perf_counter() - start, succeeded))
+        return timed
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+def run_single(mode, concurrency, students, semesters, url, adaptive=False, fast_load=False):
+    """Runs result-saver.py's own pipeline (scheduler, retries, circuit breaker, manifest, merge) in a scratch folder."""
+    result_saver = load_script("result-saver.py")
+    result_saver.tqdm.write = lambda *args, **kwargs: None  # Keep stdout clean for the JSON line
+    result_saver.PORTAL_URL = url
+    lookups = LookupLog()
+    # The workers look these up at call time, so every lookup they make is timed
+    for name in ("fetch_result_http", "fetch_result_browser", "fetch_result_tab"):
+        setattr(result_saver, name, lookups.wrap(getattr(result_saver, name)))
+    limiter = result_saver.AdaptiveLimiter(concurrency, adaptive)
+    semester_list = [str(sem) for sem in range(1, semesters + 1)]
+    student_jobs = synthetic_students(result_saver, students)
+    driver_path = None
+    if mode in ("browser", "tabs"):
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver_path = ChromeDriverManager().install()
+
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Saved pages, merged PDFs and the manifest go to the scratch folder, never to the real Information folder
+        os.chdir(work_dir)
+        try:
+            manifest = result_saver.ResultManifest(resume=False, kind="html" if mode == "http" else "pdf")
+            tabs = result_saver.TabBrowser(driver_path, fast_load) if mode == "tabs" else None
+            try:
+                with RssSampler() as rss:
+                    start = time.perf_counter()
+                    if mode == "http":
+                        result_saver.process_semesters_http(semester_list, student_jobs, manifest, None, concurrency, limiter)
+                    else:
+                        result_saver.process_semesters_browser(semester_list, student_jobs, driver_path, manifest, None, concurrency,
+                                                               limiter=limiter, tabs=tabs, fast_load=fast_load)
+                    elapsed = time.perf_counter() - start
+            finally:
+                if tabs:
+                    tabs.stop()
+                manifest.close()
+        finally:
+            os.chdir(previous_dir)
+
+    outcomes = collections.Counter(entry["status"] for entry in manifest.entries.values())
+    latencies = [seconds for seconds, succeeded in lookups.samples if succeeded]
+    failed_lookups = sum(1 for seconds, succeeded in lookups.samples if not succeeded)
+    finished = len(student_jobs) * len(semester_list)
+    return {
+        "mode": mode,
+        "concurrency": concurrency,
+        "final_limit": limiter.limit,
+        "students": finished,
+        "seconds": round(elapsed, 2),
+        "students_per_minute": round(finished / elapsed * 60, 1) if elapsed else 0.0,
+        "p50": round(statistics.median(latencies), 3) if latencies else 0.0,
+        "p95": round(percentile(latencies, 0.95), 3),
+        # The last failed lookup of a student that ran out of attempts is not retried
+        "retries": failed_lookups - outcomes["failed"],
+        "failed": outcomes["failed"],
+        "peak_rss_mb": round(rss.peak / (1024 * 1024), 1) if rss.peak else None
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark result-saver.py fetch modes against a local mock portal.")
+    parser.add_argument("--modes", default="http,browser", help="Comma separated fetch modes to run: http, browser, tabs (default: http,browser)")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma separated concurrency levels (default: 1,2,4,8)")
+    parser.add_argument("--students", type=int, default=50, help="Students per semester (default: 50)")
+    parser.add_argument("--semesters", type=int, default=1, help="Number of semesters (default: 1)")
+    parser.add_argument("--latency", type=float, default=0.2, help="Average mock portal latency in seconds (default: 0.2)")
+    parser.add_argument("--load-latency", type=float, default=0.0, help="Extra mock portal latency per other request in flight (default: 0)")
+    parser.add_argument("--adaptive", action="store_true", help="Treat each concurrency level as a ceiling for result-saver.py's adaptive limiter")
+    parser.add_argument("--fast-load", action="store_true", help="Use result-saver.py's --fast-load Chrome profile in browser and tabs modes")
+    parser.add_argument("--error-rate", type=float, default=0.02, help="Fraction of mock portal requests that fail with 503 (default: 0.02)")
+    parser.add_argument("--no-record-rate", type=float, default=0.05, help="Fraction of students with no record (default: 0.05)")
+    parser.add_argument("--output", help="Also write the results as JSON to this file")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        # Child process: one configuration, so peak memory is measured in isolation
+        mode, concurrency = args.single.split(":")
+        print(json.dumps(run_single(mode, int(concurrency), args.students, args.semesters, args.url, args.adaptive, args.fast_load)))
+        sys.exit(0)
+
+    mock_portal = load_script("mock-portal.py")
+    server = mock_portal.create_server(0, args.latency, args.error_rate, args.no_record_rate, seed=42, load_latency=args.load_latency)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}{mock_portal.SEARCH_PATH}"
+    print(f"🧪 Mock portal at {url} (latency {args.latency}s, error rate {args.error_rate})\n")
+
+    results = []
+    header = f"{'mode':<8} {'conc':>4} {'limit':>5} {'students':>8} {'stu/min':>8} {'p50 s':>7} {'p95 s':>7} {'retries':>7} {'failed':>6} {'peak RSS MB':>11} {'MB served':>9}"
+    print(header)
+    print("-" * len(header))
+    for mode in [m.strip() for m in args.modes.split(",") if m.strip()]:
+        for concurrency in [int(c) for c in args.concurrency.split(",") if c.strip()]:
+            bytes_before = server.RequestHandlerClass.state.stats["bytes"]
+            completed = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--single", f"{mode}:{concurrency}",
+                 "--students", str(args.students), "--semesters", str(args.semesters), "--url", url]
+                + (["--adaptive"] if args.adaptive else []) + (["--fast-load"] if args.fast_load else []),
+                capture_output=True, text=True
+            )
+            if completed.returncode != 0:
+                error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit code {completed.returncode}"
+                print(f"{mode:<8} {concurrency:>4}  ❌ {error}")
+                continue
+            row = json.loads(completed.stdout.strip().splitlines()[-1])
+            row["mb_served"] = round((server.RequestHandlerClass.state.stats["bytes"] - bytes_before) / (1024 * 1024), 2)
+            results.append(row)
+            peak = row["peak_rss_mb"] if row["peak_rss_mb"] is not None else "n/a"
+            print(f"{mode:<8} {concurrency:>4} {row['final_limit']:>5} {row['students']:>8} {row['students_per_minute']:>8} {row['p50']:>7} {row['p95']:>7} {row['retries']:>7} {row['failed']:>6} {peak:>11} {row['mb_served']:>9}")
+
+    server.shutdown()
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✅ Results saved to {args.output}")
@@ -0,0 +1,230 @@
+# Local stand-in for the DDU result portal, for testing and benchmarking result-saver.py offline
+
+import time
+import random
+import hashlib
+import argparse
+import secrets
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from http.cookies import SimpleCookie
+from urllib.parse import parse_qs, urlparse
+
+SEARCH_PATH = "/result2023/searchresult_new.aspx"
+RESULT_PATH = "/result2023/result_new.aspx"
+PRINT_PATH = "/result2023/printresult_new.aspx"
+STYLE_PATH = "/result2023/style.css"
+LOGO_PATH = "/result2023/logo.png"
+
+# Page assets a real browser downloads on every visit, sized roughly like the portal's own
+ASSETS = {
+    STYLE_PATH: ("text/css", b"body { font-family: Arial, sans-serif; } table { border-collapse: collapse; } td { padding: 4px; }\n" * 200),
+    LOGO_PATH: ("image/png", b"\x89PNG\r\n\x1a\n" + bytes(range(256)) * 600),
+}
+ASSET_TAGS = f'<link rel="stylesheet" href="{STYLE_PATH}" /><img src="{LOGO_PATH}" alt="DDU" />'
+
+SUBJECTS = {
+    "1": ["MAT101", "MAT102", "PHY101", "CHE101", "AE101"],
+    "2": ["MAT201", "MAT202", "PHY201", "CHE201", "SE201"],
+}
+
+class PortalState:
+    def __init__(self, latency, error_rate, no_record_rate, use_alert, seed, load_latency=0.0):
+        self.latency = latency
+        self.load_latency = load_latency
+        self.in_flight = 0
+        self.error_rate = error_rate
+        self.no_record_rate = no_record_rate
+        self.use_alert = use_alert
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.viewstates = set()
+        self.sessions = {}
+        self.stats = {"requests": 0, "errors": 0, "searches": 0, "no_record": 0, "bytes": 0}
+
+    def roll_dice(self):
+        with self.lock:
+            return self.random.random()
+
+    def enter(self):
+        with self.lock:
+            self.in_flight += 1
+            return self.in_flight
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def count(self, key, amount=1):
+        with self.lock:
+            self.stats[key] += amount
+
+def student_hash(roll_no, semester):
+    return int(hashlib.sha256(f"{roll_no}:{semester}".encode()).hexdigest(), 16)
+
+def has_record(state, roll_no, semester):
+    # Deterministic per student, so repeated runs see the same "No Record found" students
+    return (student_hash(roll_no, semester) % 1000) / 1000 >= state.no_record_rate
+
+def search_page(state, message=""):
+    viewstate = secrets.token_urlsafe(24)
+    with state.lock:
+        state.viewstates.add(viewstate)
+    options = "".join(f'<option value="{sem}">Semester {sem}</option>' for sem in range(1, 9))
+    return f"""<html><head><title>Result</title>{ASSET_TAGS}</head><body>
+<form method="post" action="searchresult_new.aspx" id="form1">
+<input type="hidden" name="__VIEWSTATE" id="__VIEWSTATE" value="{viewstate}" />
+<input type="hidden" name="__VIEWSTATEGENERATOR" id="__VIEWSTATEGENERATOR" value="4A5F7E3B" />
+<input type="hidden" name="__EVENTVALIDATION" id="__EVENTVALIDATION" value="{secrets.token_urlsafe(16)}" />
+<select name="ddlsem" id="ddlsem"><option value="0">--Select--</option>{options}</select>
+<input name="txtRollno" type="text" id="txtRollno" />
+<input name="txtDob" type="text" id="txtDob" />
+<input type="submit" name="btnSearch" value="Search Result" id="btnSearch" />
+{message}
+</form></body></html>"""
+
+def result_tables(roll_no, semester, dob):
+    seed = student_hash(roll_no, semester)
+    subjects = SUBJECTS.get(semester, [f"MAT{semester}01", f"MAT{semester}02", f"PHY{semester}01", f"CHE{semester}01"])
+    marks = [(seed >> (i * 7)) % 61 + 35 for i in range(len(subjects))]
+    sgpa = round(sum(marks) / len(marks) / 10, 2)
+    rows = [
+        ["Name", f"STUDENT {roll_no}", "Roll No", roll_no],
+        ["Date of Birth", dob, "Semester", f"Semester {semester}"],
+    ]
+    subject_rows = [["Paper Code", "Paper Name", "Max Marks", "Obt. Marks"]]
+    subject_rows += [[code, f"Paper {code}", "100", str(mark)] for code, mark in zip(subjects, marks)]
+    footer = [["Result : PASSED", f"(SGPA) : {sgpa}", f"(CGPA) : {sgpa}", "Carry Over Paper :"]]
+
+    def table(table_rows):
+        return "<table border='1'>" + "".join(
+            "<tr>" + "".join(f"<td>{cell}</td>" for cell in row) + "</tr>" for row in table_rows
+        ) + "</table>"
+
+    return table(rows) + table(subject_rows) + table(footer)
+
+class PortalHandler(BaseHTTPRequestHandler):
+    state = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_html(self, html, status=200, headers=None, content_type="text/html; charset=utf-8"):
+        body = html.encode("utf-8") if isinstance(html, str) else html
+        self.state.count("bytes", len(body))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def session(self):
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        session_id = cookie["ASP.NET_SessionId"].value if "ASP.NET_SessionId" in cookie else None
+        with self.state.lock:
+            return self.state.sessions.get(session_id)
+
+    def simulate(self):
+        """Applies the configured latency and 5xx error rate. Returns False when an error was sent."""
+        self.state.count("requests")
+        in_flight = self.state.enter()
+        try:
+            # Like the real portal, every extra simultaneous request slows all of them down
+            delay = self.state.latency * (0.5 + self.state.roll_dice()) + self.state.load_latency * (in_flight - 1)
+            if delay:
+                time.sleep(delay)
+        finally:
+            self.state.leave()
+        if self.state.roll_dice() < self.state.error_rate:
+            self.state.count("errors")
+            self.send_html("<html><body>Service Unavailable</body></html>", status=503)
+            return False
+        return True
+
+    def do_GET(self):
+        if not self.simulate():
+            return
+        path = urlparse(self.path).path
+        if path in ASSETS:
+            content_type, body = ASSETS[path]
+            self.send_html(body, content_type=content_type)
+        elif path == SEARCH_PATH:
+            self.send_html(search_page(self.state))
+        elif path in (RESULT_PATH, PRINT_PATH):
+            session = self.session()
+            if session is None:
+                self.send_html("", status=302, headers={"Location": "searchresult_new.aspx"})
+                return
+            roll_no, semester, dob = session
+            if path == RESULT_PATH:
+                button = "<input type=\"button\" value=\"Print Result\" onclick=\"window.open('printresult_new.aspx','_blank')\" />"
+                self.send_html(f"<html><head><title>Result</title>{ASSET_TAGS}</head><body>{result_tables(roll_no, semester, dob)}{button}</body></html>")
+            else:
+                self.send_html(f"<html><head><title>Print Result</title>{ASSET_TAGS}</head><body>{result_tables(roll_no, semester, dob)}</body></html>")
+        else:
+            self.send_html("<html><body>Not Found</body></html>", status=404)
+
+    def do_POST(self):
+        if not self.simulate():
+            return
+        if urlparse(self.path).path != SEARCH_PATH:
+            self.send_html("<html><body>Not Found</body></html>", status=404)
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        form = {key: values[0] for key, values in parse_qs(self.rfile.read(length).decode("utf-8")).items()}
+        with self.state.lock:
+            valid = form.get("__VIEWSTATE") in self.state.viewstates
+            self.state.viewstates.discard(form.get("__VIEWSTATE"))
+        if not valid or "btnSearch" not in form:
+            self.send_html("<html><body>Invalid postback or callback argument.</body></html>", status=500)
+            return
+
+        self.state.count("searches")
+        roll_no = form.get("txtRollno", "").strip()
+        semester = form.get("ddlsem", "")
+        dob = form.get("txtDob", "").strip()
+        if not roll_no or not dob or not has_record(self.state, roll_no, semester):
+            self.state.count("no_record")
+            if self.state.use_alert:
+                message = "<script>alert('No Record Found');</script>"
+            else:
+                message = '<span id="lblMsg" style="color:Red;">No Record found</span>'
+            self.send_html(search_page(self.state, message))
+            return
+
+        session_id = secrets.token_hex(12)
+        with self.state.lock:
+            self.state.sessions[session_id] = (roll_no, semester, dob)
+        self.send_html("", status=302, headers={
+            "Location": "result_new.aspx",
+            "Set-Cookie": f"ASP.NET_SessionId={session_id}; path=/; HttpOnly"
+        })
+
+def create_server(port=8765, latency=0.2, error_rate=0.0, no_record_rate=0.05, use_alert=False, seed=None, load_latency=0.0):
+    handler = type("Handler", (PortalHandler,), {"state": PortalState(latency, error_rate, no_record_rate, use_alert, seed, load_latency)})
+    return ThreadingHTTPServer(("127.0.0.1", port), handler)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a local mock of the DDU result portal.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="Average seconds added to every response (default: 0.2)")
+    parser.add_argument("--load-latency", type=float, default=0.0, help="Extra seconds per other request in flight (default: 0)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 503 (default: 0)")
+    parser.add_argument("--no-record-rate", type=float, default=0.05, help="Fraction of students with no record (default: 0.05)")
+    parser.add_argument("--alert", action="store_true", help="Report missing records with a JS alert instead of the red label")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for latency and error injection")
+    args = parser.parse_args()
+
+    server = create_server(args.port, args.latency, args.error_rate, args.no_record_rate, args.alert, args.seed, args.load_latency)
+    print(f"🧪 Mock portal running at http://127.0.0.1:{args.port}{SEARCH_PATH} (Ctrl+C to stop)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stats = server.RequestHandlerClass.state.stats
+        print(f"\n📊 {stats['requests']} requests ({stats['bytes'] / (1024 * 1024):.1f} MB), {stats['searches']} searches, {stats['no_record']} no record, {stats['errors']} injected errors")
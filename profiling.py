@@ -0,0 +1,243 @@
+# Opt-in profiling shared by dob-finder.py, result-saver.py and excel-maker.py: stage timers, cProfile and tracemalloc,
+# written to a JSON report per run that can be compared with another run's report
+
+import os
+import sys
+import json
+import time
+import atexit
+import pstats
+import argparse
+import cProfile
+import threading
+import contextlib
+import tracemalloc
+from datetime import datetime
+
+PROFILE_ENV = "DDU_PROFILE"
+PROFILES_FOLDER = os.path.join("Information", "Profiles")
+PROFILE_MODES = ["timers", "cprofile", "memory"]
+TOP_FUNCTIONS = 30  # Slowest functions (by cumulative time) kept in the report
+TOP_ALLOCATIONS = 15  # Largest allocation sites kept from the peak snapshot
+TRACEBACK_FRAMES = 1
+
+def parse_modes(value):
+    """"1"/"timers", "cprofile", "memory", "all" or a comma separated mix, to the list of enabled modes. "" or "0" is off.
+
+    cprofile and memory always include the stage timers.
+    """
+    modes = set()
+    for mode in (part.strip().lower() for part in (value or "").split(",")):
+        if mode in ("", "0", "off"):
+            continue
+        if mode in ("1", "on", "timers"):
+            modes.add("timers")
+        elif mode == "all":
+            modes.update(PROFILE_MODES)
+        elif mode in PROFILE_MODES:
+            modes.update(["timers", mode])
+        else:
+            raise ValueError(f"unknown profile mode '{mode}', expected {', '.join(PROFILE_MODES)} or all")
+    return [mode for mode in PROFILE_MODES if mode in modes]
+
+def add_argument(parser):
+    parser.add_argument("--profile", nargs="?", const="timers", metavar="MODES",
+                        help=f"Time the main stages and write a report to {PROFILES_FOLDER}. Add cprofile and/or memory "
+                             f"(comma separated, or all) for function level and allocation profiles. Same as setting {PROFILE_ENV}.")
+
+class Profiler:
+    """Wall and CPU time of named stages for one run of a script, with optional cProfile and tracemalloc.
+
+    A stage may run many times and in several threads or coroutines at once (e.g. one lookup per student), every call
+    adds to its totals. CPU time is that of the thread running the stage, so it includes other coroutines scheduled
+    meanwhile. Memory peaks are approximate while stages overlap. Disabled, stage() costs next to nothing.
+    """
+
+    def __init__(self, script):
+        self.script = script
+        # Worker processes inherit the modes through the environment, they only collect stage timers
+        try:
+            self.modes = parse_modes(os.environ.get(PROFILE_ENV, ""))
+        except ValueError:
+            self.modes = []  # Reported by start()
+        self.enabled = bool(self.modes)
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.stages = {}
+        self.started = None
+        self.profiles = []
+        self.peak_snapshot = None
+        self.peak_stage = None
+        self.peak_bytes = 0
+
+    def start(self, modes=None):
+        """Starts profiling this run (modes from --profile, else from the environment) and writes the report at exit.
+
+        Raises ValueError for an unknown mode.
+        """
+        self.modes = parse_modes(modes if modes is not None else os.environ.get(PROFILE_ENV, ""))
+        self.enabled = bool(self.modes)
+        if not self.enabled:
+            return
+        os.environ[PROFILE_ENV] = ",".join(self.modes)
+        self.started = (datetime.now(), time.perf_counter(), time.process_time())
+        if "cprofile" in self.modes:
+            if sys.version_info < (3, 12):
+                # cProfile only sees the thread that enabled it, every thread started from now on gets its own
+                threading.setprofile(self.profile_thread)
+            # From Python 3.12 cProfile runs on sys.monitoring, one profile sees every thread and a second one cannot start
+            self.profile_thread()
+        if "memory" in self.modes:
+            tracemalloc.start(TRACEBACK_FRAMES)
+        atexit.register(self.finish)
+
+    def profile_thread(self, *_):
+        profile = cProfile.Profile()
+        with self.lock:
+            self.profiles.append(profile)
+        profile.enable()
+
+    @contextlib.contextmanager
+    def timed(self, name):
+        stack = self.local.__dict__.setdefault("stack", [])
+        memory = tracemalloc.is_tracing()
+        baseline = tracemalloc.get_traced_memory()[0] if memory else 0
+        if memory:
+            tracemalloc.reset_peak()
+        entry = [baseline, baseline]  # baseline, highest traced memory seen by nested stages
+        stack.append(entry)
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            stack.pop()
+            peak = None
+            if memory:
+                # A nested stage resets the peak, so its own peak is carried up to the stages around it
+                highest = max(tracemalloc.get_traced_memory()[1], entry[1])
+                peak = highest - baseline
+                if stack:
+                    stack[-1][1] = max(stack[-1][1], highest)
+                with self.lock:
+                    if highest > self.peak_bytes:
+                        self.peak_bytes = highest
+                        self.peak_stage = name
+                        self.peak_snapshot = tracemalloc.take_snapshot()
+            self.record(name, 1, wall, cpu, wall, peak)
+
+    def stage(self, name):
+        return self.timed(name) if self.enabled else contextlib.nullcontext()
+
+    def record(self, name, calls, wall, cpu, longest, peak=None):
+        with self.lock:
+            totals = self.stages.setdefault(name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "max_seconds": 0.0, "peak_mb": None})
+            totals["calls"] += calls
+            totals["wall_seconds"] += wall
+            totals["cpu_seconds"] += cpu
+            totals["max_seconds"] = max(totals["max_seconds"], longest)
+            if peak is not None:
+                totals["peak_mb"] = max(totals["peak_mb"] or 0.0, peak / (1024 * 1024))
+
+    def reset(self):
+        # A forked worker process starts with a copy of the parent's totals, it only reports its own
+        with self.lock:
+            self.stages = {}
+
+    def drain(self):
+        """Returns the stage totals collected so far and starts over, to send them from a worker process to the parent."""
+        with self.lock:
+            stages, self.stages = self.stages, {}
+        return stages
+
+    def merge(self, stages):
+        for name, totals in stages.items():
+            peak = totals["peak_mb"] * 1024 * 1024 if totals["peak_mb"] is not None else None
+            self.record(name, totals["calls"], totals["wall_seconds"], totals["cpu_seconds"], totals["max_seconds"], peak)
+
+    def report(self):
+        started, wall, cpu = self.started
+        report = {
+            "script": self.script,
+            "argv": sys.argv[1:],
+            "started": started.isoformat(timespec="seconds"),
+            "modes": self.modes,
+            "wall_seconds": round(time.perf_counter() - wall, 4),
+            "cpu_seconds": round(time.process_time() - cpu, 4),
+            "stages": {
+                name: {key: round(value, 4) if isinstance(value, float) else value for key, value in totals.items()}
+                for name, totals in sorted(self.stages.items(), key=lambda item: -item[1]["wall_seconds"])
+            },
+        }
+        if self.profiles:
+            stats = pstats.Stats(self.profiles[0])
+            for profile in self.profiles[1:]:
+                stats.add(profile)
+            report["functions"] = [
+                {"function": f"{os.path.basename(file)}:{line}({function})", "calls": calls, "total_seconds": round(total, 4), "cumulative_seconds": round(cumulative, 4)}
+                for (file, line, function), (_, calls, total, cumulative, _) in sorted(stats.stats.items(), key=lambda item: -item[1][3])[:TOP_FUNCTIONS]
+            ]
+            report["_stats"] = stats
+        if tracemalloc.is_tracing():
+            # Stages reset tracemalloc's peak, the highest one they saw is kept separately
+            report["peak_mb"] = round(max(self.peak_bytes, tracemalloc.get_traced_memory()[1]) / (1024 * 1024), 2)
+        if self.peak_snapshot is not None:
+            report["peak_stage"] = self.peak_stage
+            report["peak_allocations"] = [
+                {"line": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}", "size_mb": round(stat.size / (1024 * 1024), 3), "count": stat.count}
+                for stat in self.peak_snapshot.statistics("lineno")[:TOP_ALLOCATIONS]
+            ]
+        return report
+
+    def finish(self):
+        """Writes the report (and the raw cProfile stats next to it) and prints the stage summary. Runs once, at exit."""
+        if not self.enabled or self.started is None:
+            return
+        threading.setprofile(None)
+        for profile in self.profiles:
+            profile.disable()
+        report = self.report()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.started = None
+
+        os.makedirs(PROFILES_FOLDER, exist_ok=True)
+        path = os.path.join(PROFILES_FOLDER, f"{self.script}_{datetime.now():%Y%m%d_%H%M%S}.json")
+        stats = report.pop("_stats", None)
+        if stats is not None:
+            # Loads into pstats, snakeviz and other cProfile viewers
+            stats.dump_stats(path[:-len(".json")] + ".prof")
+            report["cprofile_file"] = os.path.basename(path[:-len(".json")] + ".prof")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+        print(f"\n⏱️ {self.script}: {report['wall_seconds']:.2f}s wall, {report['cpu_seconds']:.2f}s CPU")
+        print_stages(report["stages"])
+        print(f"📝 Profile written to {path}")
+
+def print_stages(stages):
+    print(f"   {'stage':<16} {'calls':>7} {'wall s':>9} {'CPU s':>9} {'max s':>8} {'peak MB':>8}")
+    for name, totals in stages.items():
+        peak = f"{totals['peak_mb']:.1f}" if totals.get("peak_mb") is not None else "n/a"
+        print(f"   {name:<16} {totals['calls']:>7} {totals['wall_seconds']:>9.3f} {totals['cpu_seconds']:>9.3f} {totals['max_seconds']:>8.3f} {peak:>8}")
+
+def compare(before, after):
+    """Prints every stage of two reports side by side, with the change in wall time."""
+    print(f"   {'stage':<16} {'before s':>9} {'after s':>9} {'change':>8}")
+    rows = [("total", before["wall_seconds"], after["wall_seconds"])]
+    for name in list(dict.fromkeys([*before["stages"], *after["stages"]])):
+        rows.append((name, before["stages"].get(name, {}).get("wall_seconds"), after["stages"].get(name, {}).get("wall_seconds")))
+    for name, old, new in rows:
+        change = f"{(new - old) / old * 100:+.0f}%" if old and new is not None else ""
+        print(f"   {name:<16} {'-' if old is None else f'{old:.3f}':>9} {'-' if new is None else f'{new:.3f}':>9} {change:>8}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two profile reports written with --profile.")
+    parser.add_argument("before", help="Report of the earlier run")
+    parser.add_argument("after", help="Report of the later run")
+    args = parser.parse_args()
+    reports = []
+    for path in (args.before, args.after):
+        with open(path, encoding="utf-8") as f:
+            reports.append(json.load(f))
+    compare(*reports)
@@ -0,0 +1,122 @@
+# Looks up marks, subjects and carry over papers across semesters in the result database written by excel-maker.py
+
+import os
+import sys
+import csv
+import time
+import sqlite3
+import argparse
+from urllib.request import pathname2url
+
+# Written by excel-maker.py, holds every semester it has converted
+RESULT_DB_PATH = os.path.join("Information", "docx2xlsx", "results.sqlite")
+
+# Semesters named by number sort numerically ("10" after "9"), any others after them by name
+SEMESTER_ORDER = "CAST({0} AS INTEGER) = 0, CAST({0} AS INTEGER), {0}"
+
+QUERIES = {
+    "student": (
+        ["Semester", "Roll Number", "Student's Name", "SGPA", "CGPA", "Result", "Subject", "Marks Obtained", "Carry Over Paper"],
+        "SELECT r.semester, r.roll, s.name, r.sgpa, r.cgpa, r.result, m.code, m.mark, r.carry "
+        "FROM results r JOIN students s ON s.roll = r.roll "
+        "LEFT JOIN marks m ON m.semester = r.semester AND m.position = r.position "
+        "WHERE r.roll = :key AND (:semester IS NULL OR r.semester = :semester) "
+        f"ORDER BY {SEMESTER_ORDER.format('r.semester')}, r.position, m.rowid"
+    ),
+    "subject": (
+        ["Semester", "Roll Number", "Student's Name", "Marks Obtained"],
+        "SELECT m.semester, m.roll, s.name, m.mark "
+        "FROM marks m JOIN students s ON s.roll = m.roll "
+        "WHERE m.code = :key AND (:semester IS NULL OR m.semester = :semester) "
+        # Best marks first, non-numeric marks (e.g. absent) last
+        f"ORDER BY {SEMESTER_ORDER.format('m.semester')}, m.mark GLOB '*[^0-9.]*', CAST(m.mark AS REAL) DESC, m.position"
+    ),
+    "carry": (
+        ["Semester", "Roll Number", "Student's Name", "Carry Over Paper"],
+        "SELECT c.semester, c.roll, s.name, c.code "
+        "FROM carry_overs c JOIN students s ON s.roll = c.roll "
+        "WHERE (:key IS NULL OR c.code = :key) AND (:semester IS NULL OR c.semester = :semester) "
+        f"ORDER BY {SEMESTER_ORDER.format('c.semester')}, c.code, c.position"
+    ),
+    "semesters": (
+        ["Semester", "Students", "Subjects", "Source", "Input", "Loaded At"],
+        "SELECT sem.semester, "
+        "(SELECT COUNT(*) FROM results r WHERE r.semester = sem.semester), "
+        "(SELECT COUNT(DISTINCT m.code) FROM marks m WHERE m.semester = sem.semester), "
+        "sem.source, sem.input, datetime(sem.loaded_at, 'unixepoch', 'localtime') "
+        "FROM semesters sem WHERE (:semester IS NULL OR sem.semester = :semester) "
+        f"ORDER BY {SEMESTER_ORDER.format('sem.semester')}"
+    ),
+}
+
+def connect(path):
+    # Read only, a query can never change the database (or create an empty one by mistake)
+    return sqlite3.connect(f"file:{pathname2url(os.path.abspath(path))}?mode=ro", uri=True)
+
+def run_query(conn, command, key=None, semester=None):
+    """Returns (headers, rows) of a named lookup, or of a raw SELECT for the "sql" command."""
+    if command == "sql":
+        cursor = conn.execute(key)
+        return [column[0] for column in cursor.description or []], cursor.fetchall()
+    headers, sql = QUERIES[command]
+    return headers, conn.execute(sql, {"key": key, "semester": semester}).fetchall()
+
+def format_value(value):
+    if value is None:
+        return ""
+    return str(value)
+
+def print_table(headers, rows):
+    widths = [len(header) for header in headers]
+    text_rows = [[format_value(value) for value in row] for row in rows]
+    for row in text_rows:
+        for i, value in enumerate(row):
+            widths[i] = max(widths[i], len(value))
+    for row in [headers, ["-" * width for width in widths]] + text_rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)).rstrip())
+
+def write_csv(headers, rows, f):
+    writer = csv.writer(f)
+    writer.writerow(headers)
+    writer.writerows([[format_value(value) for value in row] for row in rows])
+
+if __name__ == "__main__":
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--semester", help="Only this semester (as named by excel-maker.py, e.g. 3 or CSE_3)")
+    common.add_argument("--csv", metavar="FILE", help="Write the rows to a CSV file instead of printing them (- for stdout)")
+    common.add_argument("--db", default=RESULT_DB_PATH, help=f"Result database (default: {RESULT_DB_PATH})")
+
+    parser = argparse.ArgumentParser(description="Query the result database written by excel-maker.py.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("student", parents=[common], help="Every mark of one student across semesters").add_argument("key", metavar="ROLL")
+    commands.add_parser("subject", parents=[common], help="Every student's marks in one subject, best first").add_argument("key", metavar="CODE")
+    commands.add_parser("carry", parents=[common], help="Students with a carry over paper, in one subject or any").add_argument("key", metavar="CODE", nargs="?")
+    commands.add_parser("semesters", parents=[common], help="Semesters in the database")
+    commands.add_parser("sql", parents=[common], help="Any read-only SQL query, e.g. \"SELECT * FROM results LIMIT 5\"").add_argument("key", metavar="QUERY")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"No result database at {args.db}, run excel-maker.py first.")
+        sys.exit(1)
+
+    conn = connect(args.db)
+    try:
+        start = time.perf_counter()
+        headers, rows = run_query(conn, args.command, getattr(args, "key", None), args.semester)
+        elapsed = time.perf_counter() - start
+    except sqlite3.Error as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+    finally:
+        conn.close()
+
+    if args.csv == "-":
+        write_csv(headers, rows, sys.stdout)
+    elif args.csv:
+        # utf-8-sig so Excel shows the names correctly
+        with open(args.csv, "w", newline="", encoding="utf-8-sig") as f:
+            write_csv(headers, rows, f)
+        print(f"✅ {len(rows)} row(s) saved to {args.csv}")
+    else:
+        print_table(headers, rows)
+        print(f"\n📊 {len(rows)} row(s) in {elapsed * 1000:.1f} ms")
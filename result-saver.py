@@ -1,29 +1,825 @@
 import os
 import time
 import json
-import shutil
+import contextlib
+import sqlite3
+import hashlib
 import pandas as pd
+import re
 import base64
+import argparse
+import heapq
+import pickle
+import random
+import itertools
+import numbers
+import threading
+from collections import namedtuple, deque
+from datetime import datetime
 import concurrent.futures
+from urllib.parse import urljoin
 from tqdm import tqdm
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import Select
+from selenium.webdriver.support.ui import Select, WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    NoAlertPresentException, NoSuchElementException, TimeoutException,
+    InvalidSessionIdException, NoSuchWindowException, WebDriverException
+)
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 from pypdf import PdfReader, PdfWriter
 import requests
+import websocket
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ProtocolError
+import profiling
 
-def process_semester(sem_input, df, driver_path, position):
+# Constants
+PORTAL_URL = "https://result.ddugu.ac.in/result2023/searchresult_new.aspx"
+HTTP_MAX_CONCURRENCY = 4  # Keep this low, we want to stay a polite client of the portal
+HTTP_TIMEOUT = 30
+BROWSER_POOL_SIZE = 3  # Number of Chrome instances shared by all semesters
+TABS_POOL_SIZE = 12  # Number of isolated tabs in the single Chrome of tabs mode
+SAVED_RESULTS_FOLDER = os.path.join("Information", "Saved Results")
+# Used instead of SAVED_RESULTS_FOLDER when --url is not the real portal, so test results never mix with real ones
+TEST_RESULTS_FOLDER = os.path.join("Information", "Test Portal Results")
+MANIFEST_PATH = os.path.join(SAVED_RESULTS_FOLDER, "manifest.jsonl")
+CACHE_PATH = os.path.join(SAVED_RESULTS_FOLDER, "result_cache.sqlite")
+CACHE_TTL_DAYS = 30
+CACHE_MAX_BYTES = 500 * 1024 * 1024
+TRACES_FOLDER = os.path.join(SAVED_RESULTS_FOLDER, "Traces")
+RETRY_ATTEMPTS = 3
+RETRY_BASE_DELAY = 2
+RETRY_MAX_DELAY = 60
+BREAKER_WINDOW = 10  # Recent lookups considered by the circuit breaker
+BREAKER_THRESHOLD = 0.6  # Fraction of those that must fail (5xx, timeout, network) to pause all workers
+BREAKER_PROBE_INTERVAL = 30
+LIMITER_INITIAL = 2  # Concurrency the adaptive limiter starts from
+LIMITER_MAX_P95 = 10.0  # Seconds, above this the limiter backs off
+LIMITER_MAX_ERROR_RATE = 0.1
+LIMITER_LATENCY_FACTOR = 2.0  # Back off when median latency doubles compared to the baseline
+LIMITER_BASELINE_DRIFT = 0.2  # Share of the gap the baseline moves up each round, so a lasting slowdown becomes normal
+LIMITER_MIN_SAMPLES = 5
+
+# How long (in seconds) each readiness wait may take before the attempt is retried
+WAIT_TIMEOUTS = {
+    "form": 30,    # ddlsem present on the search page
+    "result": 30,  # Result table, "No Record found" label or a JS alert after searching
+    "popup": 10,   # "Print Result" popup window opened
+}
+WAIT_POLL_INTERVAL = 0.1
+# Fetched by the portal pages but not needed to fill and submit the form (--fast-load)
+FAST_LOAD_BLOCKED_URLS = ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.svg", "*.ico", "*.webp", "*.css", "*.woff", "*.woff2", "*.ttf", "*.eot",
+                          "*google-analytics.com*", "*googletagmanager.com*"]
+PORTAL_ERROR_MARKERS = ("service unavailable", "server error", "bad gateway", "gateway timeout")
+
+profiler = profiling.Profiler("result-saver")
+
+# One row of the shared, read-only job table
+StudentJob = namedtuple("StudentJob", ["roll", "dob"])
+
+def load_student_info(file_path):
+    """Reads the input sheet, reusing a pickled copy next to it while the sheet's mtime is unchanged."""
+    cache_path = os.path.splitext(file_path)[0] + ".cache.pkl"
+    mtime = os.path.getmtime(file_path)
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "rb") as f:
+                cached = pickle.load(f)
+            if cached["mtime"] == mtime:
+                return cached["df"]
+        except Exception:
+            pass
+
+    df = pd.read_excel(file_path)
+    try:
+        with open(cache_path, "wb") as f:
+            pickle.dump({"mtime": mtime, "df": df}, f, protocol=pickle.HIGHEST_PROTOCOL)
+    except OSError:
+        pass
+    return df
+
+def parse_dobs(dobs):
+    if pd.api.types.is_datetime64_any_dtype(dobs):
+        return dobs
+    try:
+        return pd.to_datetime(dobs, dayfirst=True, errors="coerce", format="mixed")
+    except (TypeError, ValueError):
+        # Older pandas without format="mixed"
+        return pd.to_datetime(dobs, dayfirst=True, errors="coerce")
+
+def prepare_jobs(df):
+    """Normalizes roll numbers and DOBs column-wise once. Returns (students, malformed rows, rows without a DOB)."""
+    # Only cells Excel stored as numbers lose their ".0", text like "0123456" is kept exactly as typed
+    numeric_cells = df['Roll Number'].map(lambda value: isinstance(value, numbers.Number) and not isinstance(value, bool))
+    numeric_rolls = pd.to_numeric(df['Roll Number'].where(numeric_cells), errors="coerce")
+    whole_rolls = numeric_rolls.notna() & (numeric_rolls % 1 == 0)
+    rolls = df['Roll Number'].astype(str).str.strip()
+    rolls[whole_rolls] = numeric_rolls[whole_rolls].astype("int64").astype(str)
+    rolls = rolls.str.zfill(6)
+
+    dobs = parse_dobs(df['Date of Birth'])
+    missing_dob = df['Date of Birth'].isna()
+    bad_roll = df['Roll Number'].isna() | ~rolls.str.fullmatch(r"\d+")
+    bad_dob = dobs.isna() & ~missing_dob
+    valid = ~bad_roll & ~bad_dob & ~missing_dob
+
+    malformed = df.loc[bad_roll | bad_dob, ['Roll Number', 'Date of Birth']]
+    students = tuple(
+        StudentJob(roll, dob)
+        for roll, dob in zip(rolls[valid], dobs[valid].dt.strftime('%d-%m-%Y'))
+    )
+    return students, malformed, int((missing_dob & ~bad_roll).sum())
+
+class ResultManifest:
+    """Append-only record of every finished (semester, roll) so an interrupted run can resume.
+
+    http mode saves "html" pages and the browser modes "pdf" files, each only resumes from its own kind of entries.
+    """
+
+    FINISHED = ("done", "no_record")
+
+    def __init__(self, path=MANIFEST_PATH, resume=True, kind="pdf"):
+        self.path = path
+        self.resume = resume
+        self.kind = kind
+        self.lock = threading.Lock()
+        self.entries = {}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        # Entries written before the kind was recorded are told apart by their file
+                        kind = entry.get("kind") or os.path.splitext(entry.get("path") or "")[1].lstrip(".").lower()
+                        if kind == self.kind:
+                            self.entries[(entry["semester"], entry["roll"])] = entry
+                    except (ValueError, KeyError):
+                        # A crash mid-write can only leave a partial last line, skip it
+                        continue
+
+        # O_APPEND makes every single write land whole at the end of the file
+        self.fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def is_finished(self, sem_input, roll_no, dob_str):
+        if not self.resume:
+            return False
+        entry = self.entries.get((sem_input, roll_no))
+        if not entry or entry["status"] not in self.FINISHED:
+            return False
+        # Only for the same Date of Birth: a "no_record" from a wrong one must be tried again once the sheet is fixed.
+        # Entries written before the DOB was recorded only count for a saved result
+        if entry.get("dob", dob_str if entry["status"] == "done" else None) != dob_str:
+            return False
+        # A "done" entry only counts while its output file is still there
+        return entry["status"] == "no_record" or (bool(entry.get("path")) and os.path.exists(entry["path"]))
+
+    def get(self, sem_input, roll_no):
+        return self.entries.get((sem_input, roll_no))
+
+    def record(self, sem_input, roll_no, dob_str, status, path=None):
+        entry = {
+            "semester": sem_input,
+            "roll": roll_no,
+            "dob": dob_str,
+            "kind": self.kind,
+            "status": status,
+            "path": path,
+            "timestamp": datetime.now().isoformat(timespec="seconds")
+        }
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        with self.lock:
+            os.write(self.fd, line)
+            os.fsync(self.fd)
+            self.entries[(sem_input, roll_no)] = entry
+
+    def close(self):
+        with self.lock:
+            os.close(self.fd)
+
+class ResultCache:
+    """Single-file store of raw result responses (HTML or PDF) keyed by (roll, semester, dob)."""
+
+    def __init__(self, path=CACHE_PATH, ttl_days=CACHE_TTL_DAYS, max_bytes=CACHE_MAX_BYTES, refresh=False):
+        self.ttl = ttl_days * 24 * 60 * 60
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+        self.lock = threading.Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(blobs)")]
+        if columns == ["hash", "data", "size"]:
+            # Older caches stored size after the data, so summing it read every blob from disk
+            self.conn.executescript("""
+                CREATE TABLE blobs_sized (hash TEXT PRIMARY KEY, size INTEGER NOT NULL, data BLOB NOT NULL);
+                INSERT INTO blobs_sized (hash, size, data) SELECT hash, size, data FROM blobs;
+                DROP TABLE blobs;
+                ALTER TABLE blobs_sized RENAME TO blobs;
+            """)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS blobs (
+                hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                data BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                roll TEXT NOT NULL,
+                semester TEXT NOT NULL,
+                dob TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                hash TEXT NOT NULL REFERENCES blobs(hash),
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (roll, semester, dob, kind)
+            );
+            CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+        """)
+        # Running total of the stored blobs, so a put only sweeps the store once it is over max_bytes
+        self.total_bytes = 0
+        self.evict()
+        self.conn.commit()
+
+    def get(self, roll_no, sem_input, dob_str, kind):
+        """Returns the cached bytes, or None on a miss, an expired entry or when refreshing."""
+        if self.refresh:
+            return None
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT e.fetched_at, b.data FROM entries e JOIN blobs b ON b.hash = e.hash "
+                "WHERE e.roll = ? AND e.semester = ? AND e.dob = ? AND e.kind = ?",
+                (roll_no, sem_input, dob_str, kind)
+            ).fetchone()
+            if row is None or time.time() - row[0] > self.ttl:
+                return None
+            self.conn.execute(
+                "UPDATE entries SET last_access = ? WHERE roll = ? AND semester = ? AND dob = ? AND kind = ?",
+                (time.time(), roll_no, sem_input, dob_str, kind)
+            )
+            self.conn.commit()
+            return row[1]
+
+    def put(self, roll_no, sem_input, dob_str, kind, data):
+        # Identical responses are stored once, entries only point at the content hash
+        content_hash = hashlib.sha256(data).hexdigest()
+        now = time.time()
+        with self.lock:
+            inserted = self.conn.execute("INSERT OR IGNORE INTO blobs (hash, size, data) VALUES (?, ?, ?)", (content_hash, len(data), data)).rowcount
+            self.total_bytes += len(data) if inserted else 0
+            self.conn.execute(
+                "INSERT OR REPLACE INTO entries (roll, semester, dob, kind, hash, fetched_at, last_access) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (roll_no, sem_input, dob_str, kind, content_hash, now, now)
+            )
+            if self.total_bytes > self.max_bytes:
+                self.evict()
+            self.conn.commit()
+
+    def evict(self):
+        # Drop expired entries and the blobs no entry points at, then least recently used ones until the store is a
+        # tenth below max_bytes, so a full cache is not swept again on the very next put
+        self.conn.execute("DELETE FROM entries WHERE fetched_at < ?", (time.time() - self.ttl,))
+        self.conn.execute("DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM entries)")
+        self.total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM blobs").fetchone()[0]
+        if self.total_bytes <= self.max_bytes:
+            return
+        while self.total_bytes > self.max_bytes * 0.9:
+            oldest = self.conn.execute("SELECT hash FROM entries ORDER BY last_access LIMIT 1").fetchone()
+            if oldest is None:
+                break
+            self.conn.execute("DELETE FROM entries WHERE hash = ?", oldest)
+            size = self.conn.execute("SELECT size FROM blobs WHERE hash = ?", oldest).fetchone()
+            self.conn.execute("DELETE FROM blobs WHERE hash = ?", oldest)
+            self.total_bytes -= size[0] if size else 0
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class PortalUnavailable(Exception):
+    """The portal answered with a 5xx error page."""
+
+# One queued lookup; attempt counts the tries already made
+FetchJob = namedtuple("FetchJob", ["semester", "roll", "dob", "attempt"])
+
+DRIVER_CRASH_ERRORS = (InvalidSessionIdException, NoSuchWindowException, MaxRetryError, ProtocolError, ConnectionError)
+TIMEOUT_ERRORS = (TimeoutException, requests.Timeout, TimeoutError)
+
+def classify_failure(exc):
+    """Maps an exception to a retry cause: portal_down, timeout, network, driver_crash or page."""
+    if isinstance(exc, PortalUnavailable):
+        return "portal_down"
+    if isinstance(exc, requests.HTTPError) and exc.response is not None and exc.response.status_code >= 500:
+        return "portal_down"
+    if isinstance(exc, TIMEOUT_ERRORS):
+        return "timeout"
+    if isinstance(exc, requests.ConnectionError):
+        return "network"
+    # Lost connection to chromedriver or Chrome itself, the driver has to be restarted
+    if isinstance(exc, DRIVER_CRASH_ERRORS):
+        return "driver_crash"
+    if isinstance(exc, WebDriverException) and "disconnected" in str(exc).lower():
+        return "driver_crash"
+    return "page"
+
+def retry_delay(attempt):
+    # Jittered exponential backoff: ~2s, ~4s, ~8s ... capped at RETRY_MAX_DELAY
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * (2 ** attempt)) * random.uniform(0.5, 1.5)
+
+class RetryScheduler:
+    """Job queue where failed jobs wait out their backoff at the back, so workers keep draining healthy jobs."""
+
+    def __init__(self, jobs):
+        self.cond = threading.Condition()
+        self.ready = deque(jobs)
+        self.deferred = []
+        self.sequence = itertools.count()
+        self.in_flight = 0
+
+    def get(self):
+        """Blocks until a job is due. Returns None once nothing is queued, deferred or in flight."""
+        with self.cond:
+            while True:
+                now = time.monotonic()
+                while self.deferred and self.deferred[0][0] <= now:
+                    self.ready.append(heapq.heappop(self.deferred)[2])
+                if self.ready:
+                    self.in_flight += 1
+                    return self.ready.popleft()
+                if not self.deferred and self.in_flight == 0:
+                    return None
+                self.cond.wait(self.deferred[0][0] - now if self.deferred else None)
+
+    def complete(self, job):
+        with self.cond:
+            self.in_flight -= 1
+            self.cond.notify_all()
+
+    def retry(self, job):
+        delay = retry_delay(job.attempt)
+        with self.cond:
+            heapq.heappush(self.deferred, (time.monotonic() + delay, next(self.sequence), job._replace(attempt=job.attempt + 1)))
+            self.in_flight -= 1
+            self.cond.notify_all()
+        return delay
+
+    def pending(self):
+        with self.cond:
+            return len(self.ready) + len(self.deferred)
+
+class CircuitBreaker:
+    """Pauses every worker when most recent lookups fail with 5xx or timeouts, until a probe finds the portal up."""
+
+    def __init__(self, url=None, window=BREAKER_WINDOW, threshold=BREAKER_THRESHOLD, probe_interval=BREAKER_PROBE_INTERVAL):
+        self.url = url
+        self.threshold = threshold
+        self.probe_interval = probe_interval
+        self.lock = threading.Lock()
+        self.outcomes = deque(maxlen=window)
+        self.closed = threading.Event()
+        self.closed.set()
+
+    def record(self, cause=None):
+        """cause is None for a successful lookup, otherwise the classify_failure result."""
+        if cause not in (None, "portal_down", "timeout", "network"):
+            return
+        with self.lock:
+            if not self.closed.is_set():
+                return
+            self.outcomes.append(cause is None)
+            failures = self.outcomes.count(False)
+            if len(self.outcomes) == self.outcomes.maxlen and failures / len(self.outcomes) >= self.threshold:
+                self.closed.clear()
+                tqdm.write(f"🛑 Portal looks down ({failures}/{len(self.outcomes)} recent lookups failed). Pausing all workers...")
+                threading.Thread(target=self.probe, daemon=True).start()
+
+    def probe(self):
+        while True:
+            time.sleep(self.probe_interval)
+            try:
+                if requests.get(self.url or PORTAL_URL, timeout=10).status_code == 200:
+                    break
+            except requests.RequestException:
+                pass
+            tqdm.write(f"⏳ Portal still down, probing again in {self.probe_interval}s...")
+        with self.lock:
+            self.outcomes.clear()
+            self.closed.set()
+        tqdm.write("✅ Portal is back up, resuming workers.")
+
+    def wait(self):
+        self.closed.wait()
+
+class AdaptiveLimiter:
+    """AIMD limit on simultaneous portal lookups: +1 after a healthy round, halved on 5xx or timeouts, never above ceiling."""
+
+    def __init__(self, ceiling, adaptive=True, initial=LIMITER_INITIAL, max_p95=LIMITER_MAX_P95, max_error_rate=LIMITER_MAX_ERROR_RATE):
+        self.ceiling = max(1, ceiling)
+        self.adaptive = adaptive
+        self.limit = max(1, min(initial, self.ceiling)) if adaptive else self.ceiling
+        self.max_p95 = max_p95
+        self.max_error_rate = max_error_rate
+        self.cond = threading.Condition()
+        self.active = 0
+        self.latencies = []
+        self.errors = []
+        self.baseline = None
+
+    def acquire(self):
+        with self.cond:
+            while self.active >= self.limit:
+                self.cond.wait()
+            self.active += 1
+
+    def release(self, seconds, cause=None):
+        """cause is None for a successful lookup, otherwise the classify_failure result."""
+        with self.cond:
+            self.active -= 1
+            if self.adaptive:
+                self.observe(seconds, cause)
+            self.cond.notify_all()
+
+    def observe(self, seconds, cause):
+        overloaded = cause in ("portal_down", "timeout")
+        self.errors.append(overloaded or cause == "network")
+        if cause is None:
+            self.latencies.append(seconds)
+
+        # Back off as soon as the portal struggles, at most once per round of lookups at this limit
+        if overloaded and len(self.errors) >= self.limit:
+            self.set_limit(self.limit // 2, cause)
+            return
+
+        # Otherwise judge the limit once a full round of lookups has finished at it
+        if len(self.errors) < max(self.limit, LIMITER_MIN_SAMPLES) or not self.latencies:
+            return
+        p50 = percentile(self.latencies, 0.5)
+        p95 = percentile(self.latencies, 0.95)
+        error_rate = sum(self.errors) / len(self.errors)
+        # Follows a faster median straight away and a slower one gradually, otherwise a portal that stays slower for
+        # the rest of the run (e.g. on result day) would hold concurrency at 1 for good
+        if self.baseline is None or p50 < self.baseline:
+            self.baseline = p50
+        else:
+            self.baseline += (p50 - self.baseline) * LIMITER_BASELINE_DRIFT
+
+        if p95 > self.max_p95 or p50 > self.baseline * LIMITER_LATENCY_FACTOR:
+            self.set_limit(min(self.limit - 1, int(self.limit * 0.75)), f"p95 {p95:.1f}s")
+        elif error_rate > self.max_error_rate:
+            self.set_limit(min(self.limit - 1, int(self.limit * 0.75)), f"{error_rate:.0%} errors")
+        elif self.limit < self.ceiling:
+            self.set_limit(self.limit + 1, f"p95 {p95:.1f}s")
+        else:
+            self.latencies.clear()
+            self.errors.clear()
+
+    def set_limit(self, limit, reason):
+        limit = max(1, min(limit, self.ceiling))
+        if limit != self.limit:
+            arrow = "📈" if limit > self.limit else "📉"
+            tqdm.write(f"{arrow} Concurrency {self.limit} -> {limit} ({reason})")
+        self.limit = limit
+        self.latencies.clear()
+        self.errors.clear()
+
+def extract_form_data(html):
+    viewstate = re.search(r'id="__VIEWSTATE" value="([^"]*)"', html)
+    eventvalidation = re.search(r'id="__EVENTVALIDATION" value="([^"]*)"', html)
+    viewstategenerator = re.search(r'id="__VIEWSTATEGENERATOR" value="([^"]*)"', html)
+    if not all([viewstate, eventvalidation, viewstategenerator]):
+        return None
+    return {
+        "__VIEWSTATE": viewstate.group(1),
+        "__EVENTVALIDATION": eventvalidation.group(1),
+        "__VIEWSTATEGENERATOR": viewstategenerator.group(1),
+    }
+
+def find_semester_value(html, target_semester):
+    # Post the same option the browser would pick by its visible text
+    for value, text in re.findall(r'<option[^>]*value="([^"]*)"[^>]*>([^<]*)</option>', html):
+        if text.strip() == target_semester:
+            return value
+    # A guessed value fails the portal's event validation with a 500, which would look like the portal being down
+    raise Exception(f"{target_semester} is not offered by the portal")
+
+# The message of a JS alert the portal shows instead of a result, not just any script and text on the page
+NO_RECORD_ALERT = re.compile(r"""alert\(\s*['"][^'"]*(no record|not found|invalid)""", re.IGNORECASE)
+
+def is_no_record(html):
+    return "no record found" in html.lower() or NO_RECORD_ALERT.search(html) is not None
+
+def raise_for_portal_status(response):
+    if response.status_code >= 500:
+        raise PortalUnavailable(f"HTTP {response.status_code} from {response.url}")
+    response.raise_for_status()
+
+def create_http_session(max_concurrency=HTTP_MAX_CONCURRENCY):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": "Mozilla/5.0 (DDU-Result-Finder)"})
+    return session
+
+def fetch_result_http(session, sem_input, roll_no, dob_str, url=None):
+    """Runs the ASP.NET form round-trip without a browser. Returns the result HTML, or None for "No Record found"."""
     target_semester = "Semester " + sem_input
-    
-    # Create directory to save PDFs for the specific semester
-    output_folder = os.path.join("Information", "Saved Results", f"Saved_PDFs_Sem_{sem_input}")
-    os.makedirs(output_folder, exist_ok=True)
-    
+    url = url or PORTAL_URL
+
+    # Every student gets a fresh ASP.NET session
+    session.cookies.clear()
+
+    resp = session.get(url, timeout=HTTP_TIMEOUT)
+    raise_for_portal_status(resp)
+    form_data = extract_form_data(resp.text)
+    if not form_data:
+        raise Exception("ASP.NET hidden fields not found on the search page")
+
+    form_data.update({
+        "ddlsem": find_semester_value(resp.text, target_semester),
+        "txtRollno": roll_no,
+        "txtDob": dob_str,
+        "btnSearch": "Search Result"
+    })
+
+    response = session.post(url, data=form_data, allow_redirects=False, timeout=HTTP_TIMEOUT)
+    if response.status_code in (301, 302, 303):
+        result_url = urljoin(url, response.headers.get("Location", ""))
+        response = session.get(result_url, timeout=HTTP_TIMEOUT)
+    else:
+        result_url = url
+    raise_for_portal_status(response)
+    html = response.text
+
+    if is_no_record(html):
+        return None
+
+    # Prefer the printable view the "Print Result" button opens, that is what the PDFs were made from
+    if "Print Result" not in html:
+        raise Exception("Print button not found in result page")
+    popup = re.search(r"window\.open\(\s*['\"]([^'\"]+)['\"]", html)
+    if popup:
+        result_url = urljoin(result_url, popup.group(1))
+        print_response = session.get(result_url, timeout=HTTP_TIMEOUT)
+        raise_for_portal_status(print_response)
+        html = print_response.text
+
+    # Let relative stylesheets and images resolve when the file is rendered to PDF offline
+    if "<base " not in html.lower():
+        html = re.sub(r"(<head[^>]*>)", r'\1<base href="%s">' % result_url, html, count=1, flags=re.IGNORECASE)
+    return html
+
+def process_semesters_http(target_semester_list, students, manifest, cache=None, max_concurrency=HTTP_MAX_CONCURRENCY, limiter=None):
+    # One shared pool for every semester, so the portal never sees more than max_concurrency requests at a time
+    pbars = {}
+    output_folders = {}
+    for idx, sem_input in enumerate(target_semester_list):
+        output_folders[sem_input] = os.path.join(SAVED_RESULTS_FOLDER, f"Saved_HTML_Sem_{sem_input}")
+        os.makedirs(output_folders[sem_input], exist_ok=True)
+        pbars[sem_input] = tqdm(total=len(students), desc=f"Semester {sem_input}", position=idx, leave=True)
+
+    jobs = []
+    for sem_input in target_semester_list:
+        for student in students:
+            # Skip students already finished by an earlier run
+            if manifest.is_finished(sem_input, student.roll, student.dob):
+                pbars[sem_input].update(1)
+                continue
+            jobs.append(FetchJob(sem_input, student.roll, student.dob, 0))
+
+    scheduler = RetryScheduler(jobs)
+    breaker = CircuitBreaker()
+    limiter = limiter or AdaptiveLimiter(max_concurrency)
+
+    def save_result(job, html):
+        if html is None:
+            manifest.record(job.semester, job.roll, job.dob, "no_record")
+        else:
+            new_filepath = os.path.join(output_folders[job.semester], f"{job.roll}.html")
+            with profiler.stage("file_write"):
+                with open(new_filepath, "w", encoding="utf-8") as f:
+                    f.write(html)
+            manifest.record(job.semester, job.roll, job.dob, "done", new_filepath)
+        pbars[job.semester].update(1)
+
+    def worker():
+        session = create_http_session(max_concurrency)
+        while True:
+            job = scheduler.get()
+            if job is None:
+                return
+
+            # Every job taken from the scheduler is completed or requeued, even when saving it fails,
+            # otherwise the other workers would wait for it forever
+            requeued = False
+            try:
+                # Serve repeat runs from the local cache
+                with profiler.stage("cache"):
+                    cached = cache.get(job.roll, job.semester, job.dob, "html") if cache else None
+                if cached is not None:
+                    save_result(job, cached.decode("utf-8"))
+                    continue
+
+                breaker.wait()
+                limiter.acquire()
+                start = time.perf_counter()
+                try:
+                    with profiler.stage("fetch"):
+                        html = fetch_result_http(session, job.semester, job.roll, job.dob)
+                except Exception as e:
+                    cause = classify_failure(e)
+                    limiter.release(time.perf_counter() - start, cause)
+                    breaker.record(cause)
+                    if job.attempt + 1 < RETRY_ATTEMPTS:
+                        scheduler.retry(job)
+                        requeued = True
+                    else:
+                        tqdm.write(f"❌ [Semester {job.semester}] Failed Roll No: {job.roll} after {RETRY_ATTEMPTS} attempts ({cause}: {type(e).__name__})")
+                        pbars[job.semester].update(1)
+                        manifest.record(job.semester, job.roll, job.dob, "failed")
+                    continue
+
+                limiter.release(time.perf_counter() - start)
+                breaker.record()
+                if html is not None and cache:
+                    cache.put(job.roll, job.semester, job.dob, "html", html.encode("utf-8"))
+                save_result(job, html)
+            except Exception as e:
+                tqdm.write(f"❌ [Semester {job.semester}] Roll No {job.roll} could not be saved: {type(e).__name__}: {e}")
+            finally:
+                if not requeued:
+                    scheduler.complete(job)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        futures = [executor.submit(worker) for _ in range(max_concurrency)]
+        for future in concurrent.futures.as_completed(futures):
+            future.result()
+
+    for sem_input in target_semester_list:
+        pbars[sem_input].close()
+        tqdm.write(f"🎉 [Semester {sem_input}] Saved result pages to {output_folders[sem_input]}")
+
+class WaitStats:
+    """Thread-safe record of how long each readiness wait actually took."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.samples = {}
+        self.timeouts = {}
+
+    def record(self, name, seconds, ok=True):
+        with self.lock:
+            if ok:
+                self.samples.setdefault(name, []).append(seconds)
+            else:
+                self.timeouts[name] = self.timeouts.get(name, 0) + 1
+
+    def summary(self):
+        with self.lock:
+            parts = []
+            for name in sorted(set(self.samples) | set(self.timeouts)):
+                samples = self.samples.get(name, [])
+                text = f"{name}: n={len(samples)}"
+                if samples:
+                    text += f", avg {sum(samples) / len(samples):.2f}s, max {max(samples):.2f}s"
+                if self.timeouts.get(name):
+                    text += f", {self.timeouts[name]} timed out"
+                parts.append(text)
+            return " | ".join(parts)
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+class StageTrace:
+    """Times every stage of every student to a JSONL file, with per-semester summaries and a live rate."""
+
+    def __init__(self, path=None):
+        self.lock = threading.Lock()
+        self.durations = {}
+        self.retry_causes = {}
+        self.completed = []
+        self.started = time.monotonic()
+        self.file = None
+        if path:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, entry):
+        if self.file:
+            entry["timestamp"] = round(time.time(), 3)
+            self.file.write(json.dumps(entry) + "\n")
+
+    @contextlib.contextmanager
+    def stage(self, name, sem_input, roll_no):
+        start = time.perf_counter()
+        error = None
+        try:
+            with profiler.stage(name):
+                yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            with self.lock:
+                self.durations.setdefault(sem_input, {}).setdefault(name, []).append(seconds)
+                self.write({"semester": sem_input, "roll": roll_no, "stage": name, "seconds": round(seconds, 4), "error": error})
+
+    def retry(self, sem_input, roll_no, cause):
+        with self.lock:
+            causes = self.retry_causes.setdefault(sem_input, {})
+            causes[cause] = causes.get(cause, 0) + 1
+            self.write({"semester": sem_input, "roll": roll_no, "stage": "retry", "cause": cause})
+
+    def student_done(self):
+        with self.lock:
+            self.completed.append(time.monotonic())
+
+    def students_per_minute(self, window=60):
+        with self.lock:
+            now = time.monotonic()
+            recent = sum(1 for t in self.completed if now - t <= window)
+            # Early in the run the window is shorter than a minute
+            span = max(min(window, now - self.started), 1.0)
+            return recent / span * 60
+
+    def summary(self, sem_input):
+        with self.lock:
+            lines = []
+            for name, samples in self.durations.get(sem_input, {}).items():
+                lines.append(f"   {name:<14} n={len(samples):<5} p50 {percentile(samples, 0.5):6.2f}s  p95 {percentile(samples, 0.95):6.2f}s  max {max(samples):6.2f}s")
+            causes = self.retry_causes.get(sem_input)
+            if causes:
+                lines.append("   retries: " + ", ".join(f"{cause} x{count}" for cause, count in sorted(causes.items(), key=lambda item: -item[1])))
+            return "\n".join(lines)
+
+    def close(self):
+        with self.lock:
+            if self.file:
+                self.file.close()
+                self.file = None
+
+def wait_until(driver, name, condition, stats):
+    start = time.perf_counter()
+    try:
+        result = WebDriverWait(driver, WAIT_TIMEOUTS[name], poll_frequency=WAIT_POLL_INTERVAL).until(condition)
+    except TimeoutException:
+        stats.record(name, time.perf_counter() - start, ok=False)
+        raise
+    stats.record(name, time.perf_counter() - start)
+    return result
+
+def result_outcome(driver):
+    # An open alert blocks every other DOM query, so look for it first
+    try:
+        driver.switch_to.alert.text
+        return "alert"
+    except NoAlertPresentException:
+        pass
+    if driver.find_elements(By.XPATH, "//input[@value='Print Result']"):
+        return "result"
+    no_record = driver.find_elements(By.XPATH, "//*[contains(translate(text(), 'NORECDFU', 'norecdfu'), 'no record found')]")
+    if any(label.is_displayed() for label in no_record):
+        return "no_record"
+    return False
+
+def search_page_outcome(driver):
+    if driver.find_elements(By.ID, "ddlsem"):
+        return "form"
+    # A 5xx error page never grows a form, recognise it instead of waiting out the timeout
+    page_text = (driver.title or "").lower()
+    body = driver.find_elements(By.TAG_NAME, "body")
+    if body:
+        page_text += " " + body[0].text[:500].lower()
+    if any(marker in page_text for marker in PORTAL_ERROR_MARKERS):
+        return "error"
+    return False
+
+def wait_for_form(driver, stats):
+    if wait_until(driver, "form", search_page_outcome, stats) == "error":
+        raise PortalUnavailable(f"Error page instead of the search form: {driver.title}")
+
+def wait_for_result(driver, stats):
+    return wait_until(driver, "result", result_outcome, stats)
+
+def wait_for_popup(driver, known_handles, stats):
+    wait_until(driver, "popup", EC.new_window_is_opened(known_handles), stats)
+    return [handle for handle in driver.window_handles if handle not in known_handles][0]
+
+def create_driver(driver_path, headless=False, fast_load=False):
     # Setup Chrome for automatic PDF saving
     options = webdriver.ChromeOptions()
     options.add_argument("--log-level=3")  # Suppress browser logs from cluttering terminal
+    if headless or fast_load:
+        options.add_argument("--headless=new")
+        options.add_argument("--remote-allow-origins=*")
+    if fast_load:
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-gpu")
 
     settings = {
         "recentDestinations": [{
@@ -50,7 +846,7 @@ def process_semester(sem_input, df, driver_path, position):
 
     prefs = {
         'printing.print_preview_sticky_settings.appState': json.dumps(settings),
-        'savefile.default_directory': os.path.abspath(output_folder),
+        'savefile.default_directory': os.path.abspath(SAVED_RESULTS_FOLDER),
         'profile.default_content_settings.popups': 0,
         'download.prompt_for_download': False,
         'download.directory_upgrade': True
@@ -60,190 +856,641 @@ def process_semester(sem_input, df, driver_path, position):
     options.add_argument('--kiosk-printing')
     options.add_argument("--start-maximized")
 
-    # Initialize driver
     driver = webdriver.Chrome(service=Service(driver_path), options=options)
     driver.set_page_load_timeout(30)
-    
-    try:
-        # URL
-        url = "https://result.ddugu.ac.in/result2023/searchresult_new.aspx"
+    if fast_load:
+        # Only the search window is blocked, the "Print Result" popup is a new target and loads everything
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": FAST_LOAD_BLOCKED_URLS})
+    return driver
 
-        # Open the page once per semester
+def fetch_result_browser(driver, sem_input, roll_no, dob_str, wait_stats, url=None, trace=None):
+    """Searches one student's result in the given driver. Returns the PDF bytes, or None for "No Record found"."""
+    target_semester = "Semester " + sem_input
+    url = url or PORTAL_URL
+
+    def timed(name):
+        return trace.stage(name, sem_input, roll_no) if trace else contextlib.nullcontext()
+
+    # Always refresh the base page
+    with timed("page_load"):
         driver.get(url)
-        time.sleep(2)
-        
-        # Setup progress bar
-        pbar = tqdm(total=len(df), desc=f"Semester {sem_input}", position=position, leave=True)
-        
-        # Loop through students
-        for index, row in df.iterrows():
-            roll_no = str(row['Roll Number']).zfill(6)
-            roll_suffix = roll_no[-3:]  # Last three digits
-            dob = row['Date of Birth']
-        
-            # Skip if no DOB
-            if pd.isna(dob):
-                pbar.update(1)
+        wait_for_form(driver, wait_stats)
+
+    with timed("form_fill"):
+        # Fill Semester
+        semester_dropdown = Select(driver.find_element(By.ID, "ddlsem"))
+        semester_dropdown.select_by_visible_text(target_semester)
+
+        # Fill Roll No and DOB
+        roll_input = driver.find_element(By.ID, "txtRollno")
+        roll_input.clear()
+        roll_input.send_keys(roll_no)
+
+        dob_input = driver.find_element(By.ID, "txtDob")
+        dob_input.clear()
+        dob_input.send_keys(dob_str)
+
+    with timed("submit"):
+        # Click Search Result
+        search_button = driver.find_element(By.ID, "btnSearch")
+        search_button.click()
+
+        # Wait for the result page, the "No Record found" label or a JS alert
+        outcome = wait_for_result(driver, wait_stats)
+
+    with timed("outcome_check"):
+        # Handle possible "Record Not Found" JS Alert
+        if outcome == "alert":
+            alert = driver.switch_to.alert
+            alert_text = alert.text
+            alert.accept()
+            if "no record found" in alert_text.lower() or "not found" in alert_text.lower() or "invalid" in alert_text.lower():
+                return None
+            outcome = wait_for_result(driver, wait_stats)
+
+        # Handle "No Record found" red label
+        if outcome == "no_record":
+            return None
+
+        # Check if print button exists (Fail-safe, if the button is missing it implies no valid result loaded)
+        try:
+            print_button = driver.find_element(By.XPATH, "//input[@value='Print Result']")
+        except NoSuchElementException as e:
+            raise Exception("Print button not found. Retrying in case of slow load...") from e
+
+    # Save main window handle
+    main_window = driver.current_window_handle
+    known_handles = driver.window_handles
+
+    with timed("print_popup"):
+        # Click Print Result
+        print_button.click()
+
+        # Switch to the new popup window as soon as it opens
+        driver.switch_to.window(wait_for_popup(driver, known_handles, wait_stats))
+
+    try:
+        with timed("print_to_pdf"):
+            # Trigger Save as PDF directly using Chrome DevTools Protocol
+            pdf_data = driver.execute_cdp_cmd("Page.printToPDF", {
+                "printBackground": True,
+                "preferCSSPageSize": True
+            })
+    finally:
+        # Close the popup window and return to main window
+        driver.close()
+        driver.switch_to.window(main_window)
+
+    return base64.b64decode(pdf_data['data'])
+
+class CdpError(Exception):
+    """Chrome DevTools answered a command with an error (e.g. the page navigated away mid-evaluate)."""
+
+class CdpConnection:
+    """Minimal Chrome DevTools Protocol client on the browser websocket, shared by every tab."""
+
+    def __init__(self, ws_url):
+        # No Origin header, Chrome rejects DevTools websockets from unknown origins
+        self.ws = websocket.create_connection(ws_url, suppress_origin=True, enable_multithread=True)
+        self.ids = itertools.count(1)
+        self.lock = threading.Lock()
+        self.waiting = {}
+        self.listeners = {}
+        self.closed = False
+        threading.Thread(target=self.read_loop, daemon=True).start()
+
+    def read_loop(self):
+        try:
+            while True:
+                message = json.loads(self.ws.recv())
+                if "id" in message:
+                    with self.lock:
+                        slot = self.waiting.pop(message["id"], None)
+                    if slot:
+                        slot[1] = message
+                        slot[0].set()
+                else:
+                    listener = self.listeners.get(message.get("sessionId"))
+                    if listener:
+                        listener(message.get("method"), message.get("params", {}))
+        except Exception:
+            pass
+        finally:
+            # Chrome is gone, wake up everyone still waiting for an answer
+            self.closed = True
+            with self.lock:
+                for slot in self.waiting.values():
+                    slot[0].set()
+                self.waiting.clear()
+
+    def post(self, method, params=None, session_id=None):
+        """Sends a command without waiting for its answer, safe to call from an event listener."""
+        message = {"id": next(self.ids), "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        try:
+            self.ws.send(json.dumps(message))
+        except Exception as e:
+            raise ConnectionError(f"Chrome DevTools connection lost: {e}") from e
+        return message["id"]
+
+    def send(self, method, params=None, session_id=None, timeout=HTTP_TIMEOUT):
+        if self.closed:
+            raise ConnectionError("Chrome DevTools connection closed")
+        slot = [threading.Event(), None]
+        message_id = next(self.ids)
+        with self.lock:
+            self.waiting[message_id] = slot
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+        try:
+            self.ws.send(json.dumps(message))
+        except Exception as e:
+            with self.lock:
+                self.waiting.pop(message_id, None)
+            raise ConnectionError(f"Chrome DevTools connection lost: {e}") from e
+        if not slot[0].wait(timeout):
+            with self.lock:
+                self.waiting.pop(message_id, None)
+            raise TimeoutException(f"{method} got no answer within {timeout}s")
+        if slot[1] is None:
+            raise ConnectionError("Chrome DevTools connection closed")
+        if "error" in slot[1]:
+            raise CdpError(f"{method}: {slot[1]['error'].get('message')}")
+        return slot[1].get("result", {})
+
+    def close(self):
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+
+class BrowserTab:
+    """One tab in its own browser context, so its ASP.NET session cookie is never shared with other tabs."""
+
+    def __init__(self, connection, fast_load=False):
+        self.connection = connection
+        self.fast_load = fast_load
+        self.dialogs = deque()
+        self.context_id = connection.send("Target.createBrowserContext", {"disposeOnDetach": True})["browserContextId"]
+        target_id = connection.send("Target.createTarget", {"url": "about:blank", "browserContextId": self.context_id})["targetId"]
+        self.session_id = connection.send("Target.attachToTarget", {"targetId": target_id, "flatten": True})["sessionId"]
+        connection.listeners[self.session_id] = self.on_event
+        self.send("Page.enable")
+        # Without it Inspector.targetCrashed is never sent, and a crashed tab would only ever time out
+        self.send("Inspector.enable")
+        if fast_load:
+            self.send("Network.enable")
+
+    def send(self, method, params=None, timeout=HTTP_TIMEOUT):
+        return self.connection.send(method, params, self.session_id, timeout)
+
+    def on_event(self, method, params):
+        if method == "Page.javascriptDialogOpening":
+            # Accept alerts straight away, the lookup reads the message afterwards
+            self.dialogs.append(params.get("message", ""))
+            self.connection.post("Page.handleJavaScriptDialog", {"accept": True}, self.session_id)
+        elif method == "Inspector.targetCrashed":
+            self.connection.listeners.pop(self.session_id, None)
+
+    def check_alive(self):
+        if self.session_id not in self.connection.listeners:
+            raise ConnectionError("The tab crashed")
+
+    def evaluate(self, expression):
+        # Raised as a driver crash, so the worker opens a new tab instead of polling this one until a timeout
+        self.check_alive()
+        result = self.send("Runtime.evaluate", {"expression": expression, "returnByValue": True})
+        if "exceptionDetails" in result:
+            raise CdpError(result["exceptionDetails"].get("text", "JavaScript error"))
+        return result.get("result", {}).get("value")
+
+    def navigate(self, url):
+        self.check_alive()
+        result = self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            raise requests.ConnectionError(f"Could not load {url}: {result['errorText']}")
+
+    def reset(self):
+        # Every lookup starts with a fresh ASP.NET session, like a new browser would
+        self.dialogs.clear()
+        self.connection.send("Storage.clearCookies", {"browserContextId": self.context_id})
+        self.block_resources(True)
+
+    def block_resources(self, blocked):
+        # The print view is loaded in this tab too, so blocking is lifted for it and restored for the next lookup
+        if self.fast_load:
+            self.send("Network.setBlockedURLs", {"urls": FAST_LOAD_BLOCKED_URLS if blocked else []})
+
+    def quit(self):
+        self.connection.listeners.pop(self.session_id, None)
+        try:
+            self.connection.send("Target.disposeBrowserContext", {"browserContextId": self.context_id})
+        except Exception:
+            pass
+
+class TabBrowser:
+    """A single headless Chrome that hands out isolated tabs, restarted when it crashes."""
+
+    def __init__(self, driver_path, fast_load=False):
+        self.driver_path = driver_path
+        self.fast_load = fast_load
+        self.lock = threading.Lock()
+        self.driver = None
+        self.connection = None
+
+    def start(self):
+        self.driver = create_driver(self.driver_path, headless=True)
+        debugger_address = self.driver.capabilities["goog:chromeOptions"]["debuggerAddress"]
+        version = requests.get(f"http://{debugger_address}/json/version", timeout=HTTP_TIMEOUT).json()
+        self.connection = CdpConnection(version["webSocketDebuggerUrl"])
+
+    def open_tab(self):
+        with self.lock:
+            if self.connection is None or self.connection.closed:
+                self.stop()
+                self.start()
+            connection = self.connection
+        return BrowserTab(connection, self.fast_load)
+
+    def stop(self):
+        if self.connection:
+            self.connection.close()
+        if self.driver:
+            try:
+                self.driver.quit()
+            except:
+                pass
+        self.driver = None
+        self.connection = None
+
+# Same checks as search_page_outcome and result_outcome, evaluated inside the tab
+SEARCH_OUTCOME_JS = """(() => {
+    if (document.getElementById('ddlsem')) return 'form';
+    const text = ((document.title || '') + ' ' + (document.body ? document.body.innerText.slice(0, 500) : '')).toLowerCase();
+    return %s.some(marker => text.includes(marker)) ? 'error' : false;
+})()""" % json.dumps(PORTAL_ERROR_MARKERS)
+
+RESULT_OUTCOME_JS = """(() => {
+    if (document.querySelector("input[value='Print Result']")) return 'result';
+    const labels = Array.from(document.querySelectorAll('body *')).filter(el =>
+        Array.from(el.childNodes).some(node => node.nodeType === 3 && node.textContent.toLowerCase().includes('no record found')));
+    return labels.some(el => el.offsetParent !== null) ? 'no_record' : false;
+})()"""
+
+FILL_FORM_JS = """((semester, roll, dob) => {
+    const select = document.getElementById('ddlsem');
+    const option = Array.from(select.options).find(option => option.text.trim() === semester);
+    if (!option) return false;
+    select.value = option.value;
+    select.dispatchEvent(new Event('change', {bubbles: true}));
+    document.getElementById('txtRollno').value = roll;
+    document.getElementById('txtDob').value = dob;
+    return true;
+})(%s, %s, %s)"""
+
+# The print view opens with window.open, load it in the same tab (and browser context) instead of a popup
+OPEN_PRINT_VIEW_JS = """(() => {
+    const button = document.querySelector("input[value='Print Result']");
+    if (!button) return false;
+    window.open = url => { location.href = new URL(url, location.href).href; return null; };
+    button.click();
+    return true;
+})()"""
+
+PRINT_VIEW_READY_JS = """(() => document.readyState === 'complete' && location.href !== %s
+    && !document.querySelector("input[value='Print Result']"))()"""
+
+def tab_condition(expression):
+    def condition(tab):
+        try:
+            return tab.evaluate(expression)
+        except CdpError:
+            # The page is navigating and its JavaScript context is gone, try again on the next poll
+            return False
+    return condition
+
+def tab_result_outcome(tab):
+    if tab.dialogs:
+        return "alert"
+    return tab_condition(RESULT_OUTCOME_JS)(tab)
+
+def fetch_result_tab(tab, sem_input, roll_no, dob_str, wait_stats, url=None, trace=None):
+    """Searches one student's result in an isolated tab. Returns the PDF bytes, or None for "No Record found"."""
+    target_semester = "Semester " + sem_input
+    url = url or PORTAL_URL
+
+    def timed(name):
+        return trace.stage(name, sem_input, roll_no) if trace else contextlib.nullcontext()
+
+    with timed("page_load"):
+        tab.reset()
+        tab.navigate(url)
+        if wait_until(tab, "form", tab_condition(SEARCH_OUTCOME_JS), wait_stats) == "error":
+            raise PortalUnavailable(f"Error page instead of the search form: {tab.evaluate('document.title')}")
+
+    with timed("form_fill"):
+        if not tab.evaluate(FILL_FORM_JS % (json.dumps(target_semester), json.dumps(roll_no), json.dumps(dob_str))):
+            raise Exception(f"{target_semester} is not offered by the portal")
+
+    with timed("submit"):
+        tab.evaluate("document.getElementById('btnSearch').click()")
+        outcome = wait_until(tab, "result", tab_result_outcome, wait_stats)
+
+    with timed("outcome_check"):
+        if outcome == "alert":
+            alert_text = tab.dialogs.popleft().lower()
+            if "no record found" in alert_text or "not found" in alert_text or "invalid" in alert_text:
+                return None
+            outcome = wait_until(tab, "result", tab_result_outcome, wait_stats)
+
+        if outcome == "no_record":
+            return None
+
+    with timed("print_popup"):
+        result_url = tab.evaluate("location.href")
+        tab.block_resources(False)
+        if not tab.evaluate(OPEN_PRINT_VIEW_JS):
+            raise Exception("Print button not found. Retrying in case of slow load...")
+        wait_until(tab, "popup", tab_condition(PRINT_VIEW_READY_JS % json.dumps(result_url)), wait_stats)
+
+    with timed("print_to_pdf"):
+        pdf_data = tab.send("Page.printToPDF", {
+            "printBackground": True,
+            "preferCSSPageSize": True
+        })
+
+    return base64.b64decode(pdf_data['data'])
+
+class SemesterMerger:
+    """Merges result pages in full roll number order as they arrive, reading each one from its saved PDF.
+
+    Only the paths of pages that arrive ahead of their turn are held, but the merged pages stay in one PdfWriter until
+    finish() writes the semester PDF: pypdf cannot write a document incrementally, so the whole semester is in memory
+    at the end, as it always was.
+    """
+
+    def __init__(self, sem_input, roll_order):
+        self.target_semester = "Semester " + sem_input
+        self.output_pdf_path = os.path.join(SAVED_RESULTS_FOLDER, f"{sem_input}.pdf")
+        self.roll_order = sorted(dict.fromkeys(roll_order), key=int)
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.next_index = 0
+        self.writer = PdfWriter()
+
+    def add(self, roll_no, source):
+        """source is the path to the student's saved PDF, or None when the student has no page."""
+        with self.lock:
+            self.pending[roll_no] = source
+            # Only append once every earlier roll has reported, so pages stay in roll order
+            while self.next_index < len(self.roll_order) and self.roll_order[self.next_index] in self.pending:
+                roll = self.roll_order[self.next_index]
+                self.append_page(roll, self.pending.pop(roll))
+                self.next_index += 1
+
+    def append_page(self, roll_no, source):
+        if source is None:
+            return
+        try:
+            reader = PdfReader(source)
+            if len(reader.pages) > 0:
+                self.writer.add_page(reader.pages[0])
+        except Exception as e:
+            tqdm.write(f"❌ [{self.target_semester}] Error processing Roll No {roll_no}: {e}")
+
+    def finish(self):
+        with self.lock:
+            # Whatever is still pending (e.g. a worker crashed) goes at the end, still in roll order
+            for roll in self.roll_order[self.next_index:]:
+                if roll in self.pending:
+                    self.append_page(roll, self.pending.pop(roll))
+            self.next_index = len(self.roll_order)
+
+            if len(self.writer.pages) == 0:
+                tqdm.write(f"⚠️ [{self.target_semester}] No valid PDFs found to merge. Empty PDF was not created.")
+                return
+
+            with open(self.output_pdf_path, "wb") as out_file:
+                self.writer.write(out_file)
+            tqdm.write(f"✅ [{self.target_semester}] Merged PDF saved to {self.output_pdf_path}")
+
+def process_semesters_browser(target_semester_list, students, driver_path, manifest, cache=None, pool_size=BROWSER_POOL_SIZE, trace=None, limiter=None, tabs=None, fast_load=False):
+    """Works through every (semester, roll) job with a pool of Chrome instances, or of isolated tabs in one Chrome when tabs is a TabBrowser."""
+    wait_stats = WaitStats()
+    trace = trace or StageTrace()
+    pbars = {}
+    mergers = {}
+    remaining = {}
+    remaining_lock = threading.Lock()
+    roll_numbers = [student.roll for student in students]
+
+    # One queue of (semester, roll, dob) jobs shared by every driver in the pool
+    jobs = []
+    for idx, sem_input in enumerate(target_semester_list):
+        os.makedirs(os.path.join(SAVED_RESULTS_FOLDER, f"Saved_PDFs_Sem_{sem_input}"), exist_ok=True)
+        pbars[sem_input] = tqdm(total=len(students), desc=f"Semester {sem_input}", position=idx, leave=True)
+        mergers[sem_input] = SemesterMerger(sem_input, roll_numbers)
+        remaining[sem_input] = 0
+        for student in students:
+            # Skip students already finished by an earlier run, their saved page still goes into the merge
+            if manifest.is_finished(sem_input, student.roll, student.dob):
+                mergers[sem_input].add(student.roll, manifest.get(sem_input, student.roll)["path"])
+                pbars[sem_input].update(1)
                 continue
-        
-            # Format DOB
-            if isinstance(dob, pd.Timestamp):
-                dob_str = dob.strftime('%d-%m-%Y')
-            else:
-                try:
-                    dob_obj = pd.to_datetime(dob, dayfirst=True)
-                    dob_str = dob_obj.strftime('%d-%m-%Y')
-                except:
-                    dob_str = str(dob)
-                    
-            for attempt in range(3):
-                skip = False
+            jobs.append(FetchJob(sem_input, student.roll, student.dob, 0))
+            remaining[sem_input] += 1
+
+    # Semesters that were already complete only need their merged PDF rebuilt
+    for sem_input in target_semester_list:
+        if remaining[sem_input] == 0:
+            pbars[sem_input].close()
+            tqdm.write(f"🔁 [Semester {sem_input}] All students already saved in an earlier run.")
+            mergers[sem_input].finish()
+
+    scheduler = RetryScheduler(jobs)
+    breaker = CircuitBreaker()
+    limiter = limiter or AdaptiveLimiter(pool_size)
+
+    def finish_job(sem_input, roll_no, pdf_path):
+        with trace.stage("merge", sem_input, roll_no):
+            mergers[sem_input].add(roll_no, pdf_path)
+        trace.student_done()
+        pbars[sem_input].update(1)
+        # Live throughput across the whole pool, and how much work is still waiting
+        pbars[sem_input].set_postfix_str(f"{trace.students_per_minute():.1f} students/min, queue {scheduler.pending()}, concurrency {limiter.limit}/{limiter.ceiling}")
+        with remaining_lock:
+            remaining[sem_input] -= 1
+            semester_done = remaining[sem_input] == 0
+        if semester_done:
+            pbars[sem_input].close()
+            tqdm.write(f"🎉 [Semester {sem_input}] Finished downloading PDFs!")
+            with trace.stage("merge", sem_input, None):
+                mergers[sem_input].finish()
+            summary = trace.summary(sem_input)
+            if summary:
+                tqdm.write(f"⏱️ [Semester {sem_input}] Stage timings:\n{summary}")
+
+    def save_result(job, pdf_bytes):
+        new_filepath = None
+        if pdf_bytes is None:
+            manifest.record(job.semester, job.roll, job.dob, "no_record")
+        else:
+            new_filepath = os.path.join(SAVED_RESULTS_FOLDER, f"Saved_PDFs_Sem_{job.semester}", f"{job.roll}.pdf")
+            with trace.stage("file_write", job.semester, job.roll):
+                with open(new_filepath, "wb") as f:
+                    f.write(pdf_bytes)
+            manifest.record(job.semester, job.roll, job.dob, "done", new_filepath)
+        # The merger reads the page back from the saved file, so it never holds the bytes of pages waiting their turn
+        finish_job(job.semester, job.roll, new_filepath)
+
+    def worker():
+        # Chrome (or the tab) only starts once the limiter first lets this worker run a lookup
+        driver = None
+        try:
+            while True:
+                job = scheduler.get()
+                if job is None:
+                    return
+
+                # Every job taken from the scheduler is completed or requeued, even when saving or merging it
+                # fails, otherwise the other workers would wait for it forever
+                requeued = False
                 try:
-                    # Always refresh the base page
-                    driver.get(url)
-                    time.sleep(2)
-            
-                    # Fill Semester
-                    semester_dropdown = Select(driver.find_element(By.ID, "ddlsem"))
-                    semester_dropdown.select_by_visible_text(target_semester)
-            
-                    # Fill Roll No and DOB
-                    roll_input = driver.find_element(By.ID, "txtRollno")
-                    roll_input.clear()
-                    roll_input.send_keys(roll_no)
-            
-                    dob_input = driver.find_element(By.ID, "txtDob")
-                    dob_input.clear()
-                    dob_input.send_keys(dob_str)
-            
-                    # Click Search Result
-                    search_button = driver.find_element(By.ID, "btnSearch")
-                    search_button.click()
-            
-                    time.sleep(2)  # Wait for the result page to load
-        
-                    # Handle possible "Record Not Found" JS Alert
-                    try:
-                        alert = driver.switch_to.alert
-                        alert_text = alert.text
-                        if "no record found" in alert_text.lower() or "not found" in alert_text.lower() or "invalid" in alert_text.lower():
-                            alert.accept()
-                            skip = True
-                            break
-                        alert.accept()
-                    except:
-                        pass
-                        
-                    # Handle "No Record found" text in page source (matches the red label)
-                    if not skip and "no record found" in driver.page_source.lower():
-                        skip = True
-                        break
-        
-                    # Check if print button exists (Fail-safe, if the button is missing it implies no valid result loaded)
+                    # Serve repeat runs from the local cache
+                    with profiler.stage("cache"):
+                        cached = cache.get(job.roll, job.semester, job.dob, "pdf") if cache else None
+                    if cached is not None:
+                        save_result(job, cached)
+                        continue
+
+                    breaker.wait()
+                    limiter.acquire()
+                    start = time.perf_counter()
                     try:
-                        print_button = driver.find_element(By.XPATH, "//input[@value='Print Result']")
+                        if driver is None:
+                            driver = tabs.open_tab() if tabs else create_driver(driver_path, fast_load=fast_load)
+                            # Chrome's cold start is not portal latency, the limiter only times the lookup itself
+                            start = time.perf_counter()
+                        fetch = fetch_result_tab if tabs else fetch_result_browser
+                        pdf_bytes = fetch(driver, job.semester, job.roll, job.dob, wait_stats, trace=trace)
                     except Exception as e:
-                        raise Exception("Print button not found. Retrying in case of slow load...") from e
-            
-                    # Save main window handle
-                    main_window = driver.current_window_handle
-            
-                    # Click Print Result
-                    print_button.click()
-                    time.sleep(2)
-            
-                    # Switch to the new popup window
-                    for handle in driver.window_handles:
-                        if handle != main_window:
-                            driver.switch_to.window(handle)
-                            break
-            
-                    # Trigger Save as PDF directly using Chrome DevTools Protocol
-                    pdf_data = driver.execute_cdp_cmd("Page.printToPDF", {
-                        "printBackground": True,
-                        "preferCSSPageSize": True
-                    })
-            
-                    new_filename = f"{roll_suffix}.pdf"
-                    new_filepath = os.path.join(output_folder, new_filename)
-            
-                    with open(new_filepath, "wb") as f:
-                        f.write(base64.b64decode(pdf_data['data']))
-            
-                    # Close the popup window
-                    driver.close()
-            
-                    # Return to main window
-                    driver.switch_to.window(main_window)
-                    
-                    # Success
-                    break
-            
-                except Exception as e:
-                    error_msg = str(e).lower()
-                    if attempt < 2:
-                        # If it's a critical webdriver crash/connection issue, restart the driver
-                        if "connection" in error_msg or "actively refused" in error_msg or "forcibly closed" in error_msg or "max retries" in error_msg or "disconnected" in error_msg:
+                        cause = classify_failure(e)
+                        limiter.release(time.perf_counter() - start, cause)
+                        breaker.record(cause)
+                        trace.retry(job.semester, job.roll, cause)
+
+                        # If it's a webdriver crash/connection issue, restart the driver on the next lookup
+                        if cause == "driver_crash" and driver is not None:
                             try:
                                 driver.quit()
                             except:
                                 pass
-                            # Re-initialize driver
-                            driver = webdriver.Chrome(service=Service(driver_path), options=options)
-                            driver.set_page_load_timeout(30)
-                        time.sleep(2)
-                    else:
-                        error_name = type(e).__name__
-                        tqdm.write(f"❌ [{target_semester}] Failed Roll No: {roll_no} after 3 attempts ({error_name})")
-                
-            pbar.update(1)
-                
-        pbar.close()
-        tqdm.write(f"🎉 [{target_semester}] Finished downloading PDFs!")
-
-        # --- MERGING PROCESS ---
-        tqdm.write(f"🔄 [{target_semester}] Starting merging process...")
-        output_pdf_path = os.path.join("Information", "Saved Results", f"{sem_input}.pdf")
-        
-        writer = PdfWriter()
-        
-        # Get all PDF files in the folder (sort alphabetically)
-        pdf_files = [f for f in os.listdir(output_folder) if f.lower().endswith(".pdf")]
-        pdf_files.sort()
-        
-        # Loop through each file and add the first page
-        for pdf_file in pdf_files:
-            pdf_path = os.path.join(output_folder, pdf_file)
+                            driver = None
+
+                        if job.attempt + 1 < RETRY_ATTEMPTS:
+                            # Back of the queue after a backoff, this worker moves on to the next student
+                            scheduler.retry(job)
+                            requeued = True
+                        else:
+                            tqdm.write(f"❌ [Semester {job.semester}] Failed Roll No: {job.roll} after {RETRY_ATTEMPTS} attempts ({cause}: {type(e).__name__})")
+                            manifest.record(job.semester, job.roll, job.dob, "failed")
+                            finish_job(job.semester, job.roll, None)
+                        continue
+
+                    limiter.release(time.perf_counter() - start)
+                    breaker.record()
+                    if pdf_bytes is not None and cache:
+                        cache.put(job.roll, job.semester, job.dob, "pdf", pdf_bytes)
+                    save_result(job, pdf_bytes)
+                except Exception as e:
+                    # The semester is still merged from what was saved once the pool is done
+                    tqdm.write(f"❌ [Semester {job.semester}] Roll No {job.roll} could not be saved: {type(e).__name__}: {e}")
+                finally:
+                    if not requeued:
+                        scheduler.complete(job)
+        finally:
+            if driver is not None:
+                try:
+                    driver.quit()
+                except:
+                    pass
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=pool_size) as executor:
+        futures = [executor.submit(worker) for _ in range(pool_size)]
+
+        # Wait for them to finish and catch any exceptions
+        for future in concurrent.futures.as_completed(futures):
             try:
-                reader = PdfReader(pdf_path)
-                if len(reader.pages) > 0:
-                    writer.add_page(reader.pages[0])
-            except Exception as e:
-                tqdm.write(f"❌ [{target_semester}] Error processing {pdf_file}: {e}")
-        
-        # Write the combined PDF
-        if len(writer.pages) > 0:
-            with open(output_pdf_path, "wb") as out_file:
-                writer.write(out_file)
-            tqdm.write(f"✅ [{target_semester}] Merged PDF saved to {output_pdf_path}")
-        else:
-            tqdm.write(f"⚠️ [{target_semester}] No valid PDFs found to merge. Empty PDF was not created.")
-        
-        # --- CLEANUP PROCESS ---
-        tqdm.write(f"🧹 [{target_semester}] Cleaning up individual PDF files...")
-        try:
-            shutil.rmtree(output_folder)
-            tqdm.write(f"✅ [{target_semester}] Removed intermediate folder.")
-        except Exception as e:
-            tqdm.write(f"⚠️ [{target_semester}] Could not remove folder {output_folder}: {e}")
+                future.result()
+            except Exception as exc:
+                tqdm.write(f"❌ Browser worker generated an exception: {exc}")
 
-    finally:
-        try:
-            driver.quit()
-        except:
-            pass
+    # If every worker died early, still merge whatever was saved
+    for sem_input in target_semester_list:
+        if remaining[sem_input] > 0:
+            tqdm.write(f"⚠️ [Semester {sem_input}] {remaining[sem_input]} student(s) were never processed.")
+            with trace.stage("merge", sem_input, None):
+                mergers[sem_input].finish()
+
+    if wait_stats.summary():
+        tqdm.write(f"⏱️ Wait times: {wait_stats.summary()}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Save DDU semester results for every student in the input sheet.")
+    parser.add_argument("--mode", choices=["browser", "tabs", "http"], default="browser",
+                        help="browser: print PDFs through Chrome (default). tabs: print PDFs from isolated tabs of one headless Chrome. http: save result HTML over plain HTTP, no browser needed.")
+    parser.add_argument("--max-concurrency", type=int, default=HTTP_MAX_CONCURRENCY,
+                        help=f"Upper bound on simultaneous portal requests in http mode (default: {HTTP_MAX_CONCURRENCY})")
+    parser.add_argument("--pool-size", type=int,
+                        help=f"Upper bound on Chrome instances in browser mode (default: {BROWSER_POOL_SIZE}) or tabs in tabs mode (default: {TABS_POOL_SIZE})")
+    parser.add_argument("--fast-load", action="store_true",
+                        help="Run Chrome headless and skip images, stylesheets and fonts until the print view (browser and tabs modes)")
+    parser.add_argument("--fixed-concurrency", action="store_true",
+                        help="Always use the full --max-concurrency/--pool-size instead of adapting to the portal's latency")
+    parser.add_argument("--max-p95", type=float, default=LIMITER_MAX_P95,
+                        help=f"Lookup p95 latency in seconds above which concurrency is reduced (default: {LIMITER_MAX_P95})")
+    parser.add_argument("--max-error-rate", type=float, default=LIMITER_MAX_ERROR_RATE,
+                        help=f"Error rate above which concurrency is reduced (default: {LIMITER_MAX_ERROR_RATE})")
+    parser.add_argument("--url", default=PORTAL_URL,
+                        help="Search page of the result portal (e.g. a local mock-portal.py for testing)")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Ignore cached and already saved results and fetch every student from the portal again")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write the local result cache")
+    parser.add_argument("--no-trace", action="store_true",
+                        help=f"Do not write the per-stage timing trace to {TRACES_FOLDER}")
+    parser.add_argument("--wait-timeout", action="append", default=[], metavar="NAME=SECONDS",
+                        help=f"Override a browser readiness timeout, may be repeated ({', '.join(f'{k}={v}' for k, v in WAIT_TIMEOUTS.items())})")
+    profiling.add_argument(parser)
+    args = parser.parse_args()
+
+    for override in args.wait_timeout:
+        name, _, seconds = override.partition("=")
+        if name not in WAIT_TIMEOUTS:
+            parser.error(f"Unknown wait '{name}', expected one of: {', '.join(WAIT_TIMEOUTS)}")
+        try:
+            WAIT_TIMEOUTS[name] = float(seconds)
+        except ValueError:
+            parser.error(f"Invalid timeout for '{name}': {seconds}")
+
+    try:
+        profiler.start(args.profile)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.url != PORTAL_URL:
+        # Pages from a test portal (e.g. mock-portal.py) get their own manifest, cache and folders, otherwise a later
+        # real run would skip those students or serve the test pages from the cache as real results
+        SAVED_RESULTS_FOLDER = TEST_RESULTS_FOLDER
+        MANIFEST_PATH = os.path.join(SAVED_RESULTS_FOLDER, "manifest.jsonl")
+        CACHE_PATH = os.path.join(SAVED_RESULTS_FOLDER, "result_cache.sqlite")
+        TRACES_FOLDER = os.path.join(SAVED_RESULTS_FOLDER, "Traces")
+        print(f"🧪 Not the real portal, results are saved to {SAVED_RESULTS_FOLDER}")
+    PORTAL_URL = args.url
+
     # Ask for semester input
     target_semesters_input = input("Enter the semesters separated by commas (e.g. 1, 2, 3): ").strip()
     if not target_semesters_input:
@@ -252,23 +1499,30 @@ if __name__ == "__main__":
         
     target_semester_list = [sem.strip() for sem in target_semesters_input.split(',')]
     
-    # Install driver once to avoid caching conflicts when starting multiple drivers concurrently
-    print("🔄 Ensuring latest ChromeDriver is installed...")
-    driver_path = ChromeDriverManager().install()
-
     # Read Excel
     file_path = os.path.join("Information", "Input Info", "Math Group Student Info.xlsx")
     if not os.path.exists(file_path):
         print(f"❌ Could not find {file_path}")
         exit(1)
         
-    df = pd.read_excel(file_path)
-    url = "https://result.ddugu.ac.in/result2023/searchresult_new.aspx"
+    # Normalize the sheet once, every worker shares the resulting job table
+    with profiler.stage("input"):
+        students, malformed, missing_dobs = prepare_jobs(load_student_info(file_path))
+    if len(malformed) > 0:
+        print(f"⚠️ {len(malformed)} row(s) have an invalid Roll Number or Date of Birth and will be skipped:")
+        print(malformed.to_string())
+    if missing_dobs:
+        print(f"⚠️ {missing_dobs} student(s) have no Date of Birth and will be skipped.")
+    if not students:
+        print("❌ No valid students found in the input sheet!")
+        exit(1)
+    url = PORTAL_URL
 
     # Check website status
     print("🔍 Checking website status...")
     try:
-        response = requests.get(url, timeout=10)
+        with profiler.stage("status check"):
+            response = requests.get(url, timeout=10)
         if response.status_code == 503:
             print("🛑 Website is DOWN: Service Unavailable (503)")
             print("Please try again later.")
@@ -283,21 +1537,47 @@ if __name__ == "__main__":
         print("Please check your internet connection and try again.")
         exit(1)
 
-    # Use ThreadPoolExecutor to run tasks simultaneously
-    print(f"🚀 Launching {len(target_semester_list)} simultaneous browser sessions...\n")
-    with concurrent.futures.ThreadPoolExecutor(max_workers=len(target_semester_list)) as executor:
-        # Submit tasks to threads with index for tqdm positioning
-        futures = {
-            executor.submit(process_semester, sem, df, driver_path, idx): sem 
-            for idx, sem in enumerate(target_semester_list)
-        }
-        
-        # Wait for them to finish and catch any exceptions
-        for future in concurrent.futures.as_completed(futures):
-            sem = futures[future]
-            try:
-                future.result()
-            except Exception as exc:
-                tqdm.write(f"❌ Task for Semester {sem} generated an exception: {exc}")
+    if args.mode == "http":
+        max_concurrency = max(1, args.max_concurrency)
+        print(f"🚀 Fetching results over HTTP with at most {max_concurrency} simultaneous requests...\n")
+        manifest = ResultManifest(MANIFEST_PATH, resume=not args.refresh, kind="html")
+        cache = None if args.no_cache else ResultCache(CACHE_PATH, refresh=args.refresh)
+        try:
+            limiter = AdaptiveLimiter(max_concurrency, not args.fixed_concurrency, max_p95=args.max_p95, max_error_rate=args.max_error_rate)
+            process_semesters_http(target_semester_list, students, manifest, cache, max_concurrency, limiter)
+        finally:
+            manifest.close()
+            if cache:
+                cache.close()
+        print("\n🚀 All processes completed successfully!")
+        exit(0)
+
+    # Install driver once to avoid caching conflicts when starting multiple drivers concurrently
+    print("🔄 Ensuring latest ChromeDriver is installed...")
+    driver_path = ChromeDriverManager().install()
+
+    # A fixed pool of browsers (or tabs of one browser) works through every (semester, roll) job
+    tabs = TabBrowser(driver_path, args.fast_load) if args.mode == "tabs" else None
+    pool_size = max(1, args.pool_size or (TABS_POOL_SIZE if tabs else BROWSER_POOL_SIZE))
+    if tabs:
+        print(f"🚀 Launching one headless Chrome with up to {pool_size} isolated tabs for {len(target_semester_list)} semester(s)...\n")
+    else:
+        print(f"🚀 Launching {pool_size} browser sessions for {len(target_semester_list)} semester(s)...\n")
+    manifest = ResultManifest(MANIFEST_PATH, resume=not args.refresh, kind="pdf")
+    cache = None if args.no_cache else ResultCache(CACHE_PATH, refresh=args.refresh)
+    trace_path = None if args.no_trace else os.path.join(TRACES_FOLDER, f"trace_{datetime.now():%Y%m%d_%H%M%S}.jsonl")
+    trace = StageTrace(trace_path)
+    try:
+        limiter = AdaptiveLimiter(pool_size, not args.fixed_concurrency, max_p95=args.max_p95, max_error_rate=args.max_error_rate)
+        process_semesters_browser(target_semester_list, students, driver_path, manifest, cache, pool_size, trace, limiter, tabs, args.fast_load)
+    finally:
+        if tabs:
+            tabs.stop()
+        manifest.close()
+        trace.close()
+        if cache:
+            cache.close()
+    if trace_path:
+        print(f"📝 Stage timings written to {trace_path}")
 
     print("\n🚀 All processes completed successfully!")